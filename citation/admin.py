@@ -99,6 +99,7 @@ apply_suggested_merges.short_description = "Apply suggested merges"
 class SuggestedMergeAdmin(admin.ModelAdmin):
     list_display = ['duplicate_text', 'content_type', 'new_content', 'creator', 'date_applied']
     list_filter = ['content_type', 'date_applied']
+    list_select_related = ['content_type', 'creator']
     actions = [apply_suggested_merges]
 
 
@@ -82,7 +82,7 @@ def process_entries(file_name, user):
             publication_load_error = entry_api.process(entry, user)
             if publication_load_error:
                 errors.append(publication_load_error)
-            logger.info("Processed {} Primary Publications: {}".format(ind, entry['title']))
+            logger.info("Processed %s Primary Publications: %s", ind, entry['title'])
     return errors
 
 
@@ -81,19 +81,19 @@ def match_authors_with_emails_as_linear_assignment_problem(authors: List[models.
         for email_ind in email_inds:
             author = authors[author_ind]
             email = emails[email_ind]
-            logger.debug('author {} fuzzy matched with email {}'.format(author.name, email))
+            logger.debug('author %s fuzzy matched with email %s', author.name, email)
             authors[author_ind].email = emails[email_ind]
     return []
 
 
 def combine_author_info(author_names, author_emails, author_orcids, author_researcherids) -> Tuple[
     List[models.Author], List[str]]:
-    author_name_orcid_map = defaultdict(lambda: [])
+    author_name_orcid_map = defaultdict(list)
     for author_orcid in author_orcids:
         author_name = author_orcid[1:3]
         author_name_orcid_map[author_name].append(author_orcid[0])
 
-    author_name_researcherid_map = defaultdict(lambda: [])
+    author_name_researcherid_map = defaultdict(list)
     for author_researchid in author_researcherids:
         author_name = author_researchid[1:3]
         author_name_researcherid_map[author_name].append(author_researchid[0])
@@ -190,8 +190,9 @@ def augment_authors(audit_command, publication, detached_authors):
                 augmented_authors.append(duplicate)
             else:
                 unaugmented_authors.append(detached_author)
-        logger.debug('augmented %i of %i authors', len(augmented_authors), publication.creators.count())
-        if len(augmented_authors) == publication.creators.count():
+        n_creators = publication.creators.count()
+        logger.debug('augmented %i of %i authors', len(augmented_authors), n_creators)
+        if len(augmented_authors) == n_creators:
             create_authors(audit_command, publication, unaugmented_authors)
     else:
         # We can delete all creators for a secondary publication without checking that they are referenced by other
@@ -203,7 +204,7 @@ def augment_authors(audit_command, publication, detached_authors):
 
 
 def augment_citations(audit_command, publication, entry, creator):
-    if publication.citations.count() == 0:
+    if not publication.citations.exists():
         return create_citations(publication, entry, creator)
     else:
         refs_str = entry.get("cited-references")
@@ -19,7 +19,7 @@ def make_doi(ref: str) -> str:
     except IndexError:
         return ""
 
-    match = re.search("^(?:.*DOI *)(10\..+)\.$", last)
+    match = re.search(r"^(?:.*DOI *)(10\..+)\.$", last)
     if match:
         return util.sanitize_doi(match.group(1))
     else:
@@ -103,7 +103,7 @@ def create_citation(publication: models.Publication,
     detached_citation, detached_author, detached_container, detached_raw, duplicate_citation = \
         create_detached_citation_and_related(publication, ref, creator)
 
-    logger.debug('processing citation for ref: "{}"'.format(ref))
+    logger.debug('processing citation for ref: "%s"', ref)
     if duplicate_citation:
         logger.debug('augmenting citation')
         logger.debug('container: %s (%s)', detached_container.name, detached_citation.issn)
@@ -125,9 +125,7 @@ def create_citation(publication: models.Publication,
         detached_raw.publication = citation
         detached_raw.container = citation.container
         logger.debug('container: %s (%s)', detached_raw.container.name, detached_raw.container.issn)
-        if not audit_command.has_been_saved:
-            # Save a raw value if the state has been updated
-            detached_raw.save()
+        # _augment_citation has already saved the raw value with the same publication and container if needed
 
     else:
         logger.debug('creating citation')
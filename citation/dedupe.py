@@ -1,9 +1,11 @@
 import ast
 import logging
 
+from django.core.cache import cache
 from django.db import transaction
 
 from . import models
+from .graphviz.globals import CacheNames
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +31,9 @@ class DataProcessor(object):
                 self.insert(path)
             else:
                 raise ValueError("Invalid action extension {0}. Must be '.merge' or '.split'".format(action))
+        if self.model is models.ModelDocumentation:
+            # merges and splits create model documentation without sending post_save
+            cache.delete(CacheNames.MODEL_DOCUMENTATION_LIST.value)
 
     def insert(self, path):
         with open(path, "r") as f:
@@ -69,13 +74,12 @@ class DataProcessor(object):
             record = self.model.objects.prefetch_related('publications').get(name=name)
             publications = record.publications.all()
             record.log_delete(audit_command=audit_command)
-            new_records = [self.model.objects.log_get_or_create(audit_command=audit_command,
-                                                                name=new_name)[0] for new_name in new_names]
-            for publication in publications:
-                for new_record in new_records:
-                    through_model.objects.log_get_or_create(
-                        audit_command=audit_command,
-                        **{'publication_id': publication.id, self.through_id_name: new_record.id})
+            new_records = [new_record for new_record, created in self.model.objects.bulk_log_get_or_create(
+                audit_command=audit_command, rows=[{'name': new_name} for new_name in new_names])]
+            through_model.objects.bulk_log_get_or_create(
+                audit_command=audit_command,
+                rows=[{'publication_id': publication.id, self.through_id_name: new_record.id}
+                      for publication in publications for new_record in new_records])
 
     def get_related_publications_with_name(self, names):
         criteria = {'{0}__name__in'.format(self.through_field): names}
@@ -90,10 +94,9 @@ class DataProcessor(object):
             publications = self.get_related_publications_with_name(names)
             canonical_record, created = self.model.objects.log_get_or_create(audit_command=audit_command,
                                                                              name=new_name)
-            payload = {self.through_id_name: canonical_record.id}
-            for publication in publications:
-                payload['publication_id'] = publication.id
-                self.through_model.objects.log_get_or_create(audit_command=audit_command,
-                                                             **payload)
+            self.through_model.objects.bulk_log_get_or_create(
+                audit_command=audit_command,
+                rows=[{'publication_id': publication.id, self.through_id_name: canonical_record.id}
+                      for publication in publications])
             records_to_merge.exclude(name=new_name).log_delete(audit_command=audit_command)
             return canonical_record
@@ -269,6 +269,8 @@ def get_publications(publications, modeldocumentation_dummies, platform_dummies,
         (get_publication_row(p) for p in publications.annotate(
             author_names=ArrayAgg(Concat(F('creators__given_name'), Value(' '), F('creators__family_name')),
                                   ordering=('creators__family_name', 'creators__given_name')))), index='id')
+    # a nullable integer column would otherwise become float64 and be written as 2013.0
+    df['year_published'] = df['year_published'].astype('Int64')
     codearchiveurls['count_archived'] = codearchiveurls.category == 'Archive'
     codearchiveurls['count_unavailable'] = codearchiveurls.status != 'available'
     codearchiveurls['count'] = 1
@@ -2,11 +2,11 @@ import logging
 from collections import Counter
 from datetime import datetime
 
-from django.db.models import Max
+from django.db.models import Max, Prefetch
 from haystack.query import SearchQuerySet
 
 from .globals import NetworkGroupByType
-from ..models import Publication, URLStatusLog
+from ..models import Author, Publication, URLStatusLog
 
 logger = logging.getLogger(__name__)
 
@@ -39,20 +39,15 @@ def generate_link_candidates(filter_criteria):
     if 'date_published__lte' in filter_criteria:
         end_year = datetime.strptime(filter_criteria.pop('date_published__lte'), '%Y-%m-%dT%H:%M:%SZ').year
 
-    # fetching only filtered publication
-    primary_publications = Publication.api.primary(**filter_criteria)
+    # fetching only filtered publication, year_published is stored so the year range is filtered in the database
+    primary_publications = Publication.api.primary(**filter_criteria) \
+        .filter(year_published__gte=start_year, year_published__lte=end_year)
 
-    primary_pk = []
-    primary_pubs = []
-    for pub in primary_publications:
-        if pub.year_published is not None and start_year <= pub.year_published <= end_year:
-            primary_pk.append(pub.pk)
-            primary_pubs.append(pub)
-
-    # fetches links that satisfies the given filter
-    links_candidates = primary_publications.filter(pk__in=primary_pk, citations__in=primary_pubs).values_list('pk',
-                                                                                                              'citations')
-    return links_candidates
+    # fetches links that satisfies the given filter, evaluated once here since both the nodes and the links are built
+    # from them
+    links_candidates = primary_publications.filter(citations__in=primary_publications.values('pk')) \
+        .values_list('pk', 'citations')
+    return list(links_candidates)
 
 
 def get_network_default_filter(group_by):
@@ -84,38 +79,39 @@ def generate_network_graph(filter_criteria, group_by=NetworkGroupByType.TAGS.val
 
 
 def get_links(links_candidates, nodes_index):
+    # position of each node in the node list, looked up per link instead of scanning the list
+    index_of = {pk: index for index, pk in enumerate(nodes_index)}
     links = []
     for source, target in links_candidates:
         links.append({
-            "source": nodes_index.index(source), "target": nodes_index.index(target), "value": 1
+            "source": index_of[source], "target": index_of[target], "value": 1
         })
     return links
 
 
 def get_nodes(nodes_candidates, filter_value, group_by):
-    publications = Publication.api.primary(status="REVIEWED")
+    # fetch every node's publication with its tags, sponsors and creators up front instead of querying per node
+    publications = Publication.api.primary(status="REVIEWED") \
+        .only('id', 'title') \
+        .prefetch_related('tags', 'sponsors',
+                          Prefetch('creators', queryset=Author.objects.only('id', 'given_name', 'family_name'))) \
+        .in_bulk(nodes_candidates)
     nodes = []
     for pub in nodes_candidates:
-        publication = publications.get(pk=pub)
-        group_values = []
-        if group_by == NetworkGroupByType.SPONSOR.value:
-            for name in publication.sponsors.all().values_list('name', flat=True):
-                group_values.append(name)
-        else:
-            for name in publication.tags.all().values_list('name', flat=True):
-                group_values.append(name)
-
-        value = get_common_value(group_values, filter_value)
-        if value:
-            group = value
-        else:
-            group = "Others"
+        publication = publications.get(pub)
+        if publication is None:
+            raise Publication.DoesNotExist('Publication matching id={} does not exist'.format(pub))
+        tags = [tag.name for tag in publication.tags.all()]
+        sponsors = [sponsor.name for sponsor in publication.sponsors.all()]
+        group_values = sponsors if group_by == NetworkGroupByType.SPONSOR.value else tags
+
+        group = get_common_value(group_values, filter_value) or "Others"
 
         nodes.append({
             'name': pub,
             'group': group,
-            'tags': ', '.join(['{0}'.format(s.name) for s in publication.tags.all()]),
-            'sponsors': ', '.join(['{0}'.format(s.name) for s in publication.sponsors.all()]),
+            'tags': ', '.join(tags),
+            'sponsors': ', '.join(sponsors),
             'Authors': ', '.join(
                 ['{0}, {1}.'.format(c.family_name, c.given_name_initial) for c in publication.creators.all()]),
             'title': publication.title
@@ -140,34 +136,32 @@ def generate_aggregated_distribution_data(filter_criteria, classifier, name):
     pubs = sqs.filter(**filter_criteria).models(Publication)
     availability = Counter()
     non_availability = Counter()
-    years_list = []
-    if pubs:
-        for pub in pubs:
-            is_archived = pub.is_archived
-            try:
-                date_published = pub.date_published.year
-            except:
-                date_published = None
-            if date_published is not None:
-                years_list.append(date_published)
-                bucket = availability if is_archived else non_availability
-                bucket[date_published] += 1
-
-        distribution_data = []
-        count = len(years_list)
-        for year in set(years_list):
-            present = availability[year] * 100 / count
-            absent = non_availability[year] * 100 / count
-            total = present + absent
-            distribution_data.append({
-                'relation': classifier, 'name': name, 'date': year,
-                'Code Available': availability[year],
-                'Code Not Available': non_availability[year],
-                'Code Available Per': present * 100 / total,
-                'Code Not Available Per': absent * 100 / total
-            })
-
-        return distribution_data
+    has_results = False
+    # a single pass over the search results, read as (date_published, is_archived) pairs instead of SearchResults
+    for date_published, is_archived in pubs.values_list('date_published', 'is_archived'):
+        has_results = True
+        year = getattr(date_published, 'year', None)
+        if year is not None:
+            bucket = availability if is_archived else non_availability
+            bucket[year] += 1
+    if not has_results:
+        return None
+
+    count = sum(availability.values()) + sum(non_availability.values())
+    distribution_data = []
+    for year in availability.keys() | non_availability.keys():
+        present = availability[year] * 100 / count
+        absent = non_availability[year] * 100 / count
+        total = present + absent
+        distribution_data.append({
+            'relation': classifier, 'name': name, 'date': year,
+            'Code Available': availability[year],
+            'Code Not Available': non_availability[year],
+            'Code Available Per': present * 100 / total,
+            'Code Not Available Per': absent * 100 / total
+        })
+
+    return distribution_data
 
 
 def generate_aggregated_code_archived_platform_data(filter_criteria=None):
@@ -192,7 +186,7 @@ def generate_aggregated_code_archived_platform_data(filter_criteria=None):
         for pub in pubs:
             # FIXME: this needs to be updated to work with CodeArchiveUrls (or thrown away)
             """
-            if pub.code_archive_url is not '':
+            if pub.code_archive_url:
                 platform_type = categorize_url(pub.code_archive_url)
                 platform_dct.update({platform_type: platform_dct[platform_type] + 1})
             """
@@ -32,6 +32,8 @@ class CacheNames(Enum):
     NETWORK_GRAPH_GROUP_BY_TAGS = "citation:network_graph_group_by_tags"
     # stores the name of the default tags filter used to cache it
     NETWORK_GRAPH_TAGS_FILTER = "citation:network_graph_tags_filter"
+    # stores the JSON list of model documentation rendered on the curator publication detail page
+    MODEL_DOCUMENTATION_LIST = "citation:model_documentation_list"
 
 
 class NetworkGroupByType(Enum):
@@ -21,15 +21,11 @@ class Command(BaseCommand):
             model_documentation__name__in=narrative_list)
         logger.debug(
             "-------------------------Following publication contains faulty data -----------------------------")
+        creator = User.objects.get(username='alee14')
         for pub in faulty_publications:
-            try:
-                creator = User.objects.get(username='alee14')
-                audit_command = models.AuditCommand.objects.create(action=models.AuditCommand.Action.MANUAL,
-                                                                   creator=creator)
-                publication = models.Publication.objects.get(pk=pub.id)
-                publication.log_update(audit_command, **{'flagged': True})
-                logger.info("Flagged publication successfully: " + str(pub))
-            except models.Publication.DoesNotExist:
-                logger.info("Publication Doesn't Exist: " + str(pub))
+            # only saved by log_update if the publication was not already flagged
+            audit_command = models.AuditCommand(action=models.AuditCommand.Action.MANUAL, creator=creator)
+            pub.log_update(audit_command, **{'flagged': True})
+            logger.info("Flagged publication successfully: %s", pub)
 
         logger.debug("Publication with faulty data flagged successfully")
@@ -1,7 +1,7 @@
 import logging
 
-from citation.ping_urls import verify_url_status
-from django.core.management.base import BaseCommand
+from citation.ping_urls import verify_url_status, MAX_WORKERS
+from django.core.management.base import BaseCommand, CommandError
 
 logger = logging.getLogger(__name__)
 
@@ -9,7 +9,34 @@ logger = logging.getLogger(__name__)
 class Command(BaseCommand):
     help = '''Method that check if the code archived urls are active and working or not '''
 
+    def add_arguments(self, parser):
+        parser.add_argument('--workers',
+                            type=int,
+                            default=MAX_WORKERS,
+                            help='number of urls to request concurrently')
+        parser.add_argument('--max-seconds',
+                            type=int,
+                            default=None,
+                            help='stop requesting new urls after this many seconds')
+        parser.add_argument('--shards',
+                            type=int,
+                            default=1,
+                            help='split the urls into this many disjoint shards, run one process per shard')
+        parser.add_argument('--shard-index',
+                            type=int,
+                            default=0,
+                            help='the shard this process checks, from 0 to shards - 1')
+        parser.add_argument('--start-id',
+                            type=int,
+                            default=None,
+                            help='resume an interrupted run after this CodeArchiveUrl id')
+
     def handle(self, *args, **options):
-        verify_url_status()
+        shards = options['shards']
+        shard_index = options['shard_index']
+        if shards < 1 or not 0 <= shard_index < shards:
+            raise CommandError('--shard-index must be between 0 and --shards - 1')
+        verify_url_status(max_workers=options['workers'], max_seconds=options['max_seconds'], shards=shards,
+                          shard_index=shard_index, start_id=options['start_id'])
 
     logger.debug("Validation completed")
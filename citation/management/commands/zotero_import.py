@@ -44,6 +44,19 @@ class Command(BaseCommand):
                             default='',
                             help='data file to read already persisted zotero results from')
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (model, name) -> instance, see get_or_create_by_name
+        self.named_instances = {}
+
+    def get_or_create_by_name(self, model, name):
+        # the same tags, platforms, sponsors and model documentation recur across items, look each up once per import
+        key = (model, name)
+        instance = self.named_instances.get(key)
+        if instance is None:
+            instance = self.named_instances[key] = model.objects.get_or_create(name=name)[0]
+        return instance
+
     def convert(self, name):
         s1 = first_cap_re.sub(r'\1_\2', name)
         return all_cap_re.sub(r'\1_\2', s1).upper()
@@ -89,7 +102,7 @@ class Command(BaseCommand):
             # match for codeurl
             if sliced_key == 'cod':
                 try:
-                    item.code_archive_url = re.search("(?P<url>https?://[^\s]+)", value).group("url")
+                    item.code_archive_url = re.search(r"(?P<url>https?://[^\s]+)", value).group("url")
                     if item.code_archive_url[-1] == '>':
                         item.code_archive_url = item.code_archive_url[:-1]
                 except Exception:
@@ -99,23 +112,23 @@ class Command(BaseCommand):
                 item.contact_email = value
             # match for docs
             elif sliced_key == 'doc':
-                model_documentation = ModelDocumentation.objects.get_or_create(name=value)[0]
+                model_documentation = self.get_or_create_by_name(ModelDocumentation, value)
                 models.PublicationModelDocumentations.objects.create(publication=item,
                                                                      model_documentation=model_documentation)
             # match for platform
             elif sliced_key == 'pla':
-                platform = Platform.objects.get_or_create(name=value)[0]
+                platform = self.get_or_create_by_name(Platform, value)
                 models.PublicationPlatforms.objects.create(publication=item, platform=platform)
             # match for sponsor
             elif sliced_key == 'spo':
-                sponsor = Sponsor.objects.get_or_create(name=value)[0]
+                sponsor = self.get_or_create_by_name(Sponsor, value)
                 models.PublicationSponsors.objects.create(publication=item, sponsor=sponsor)
             elif key:
                 logger.debug("Tag [%s :: %s] was added as is for publication_id %s", key, value, item.pk)
-                tag = Tag.objects.get_or_create(name=t['tag'].strip())[0]
+                tag = self.get_or_create_by_name(Tag, t['tag'].strip())
                 models.PublicationTags.objects.create(publication=item, tag=tag)
             else:
-                tag = Tag.objects.get_or_create(name=value)[0]
+                tag = self.get_or_create_by_name(Tag, value)
                 models.PublicationTags.objects.create(publication=item, tag=tag)
         try:
             item.save()
@@ -155,7 +155,7 @@ class AuthorMergeGroup:
 
         invalidated_publications = {}
 
-        all_publications = defaultdict(lambda: set())
+        all_publications = defaultdict(set)
         for publication in self.final.publications.all():
             all_publications[publication].add(self.final)
 
@@ -577,7 +577,7 @@ class PublicationMergeGroup:
 
     def is_valid_each_referenced_by_distinct(self):
         """If more than one publication in the merge group if referenced by a merge group that is an error"""
-        referenced_publications = defaultdict(lambda: 0)
+        referenced_publications = defaultdict(int)
         for referenced_by in self.final.referenced_by.all():
             referenced_publications[referenced_by] += 1
 
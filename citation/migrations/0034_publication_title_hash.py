@@ -0,0 +1,42 @@
+# Generated by Django 4.2.15 on 2026-10-16 12:30
+
+from hashlib import blake2b
+
+from django.db import migrations, models
+
+
+def hash_title(title):
+    normalized_title = ' '.join(title.split()).casefold()
+    return blake2b(normalized_title.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def populate_title_hashes(apps, schema_editor):
+    Publication = apps.get_model('citation', 'Publication')
+    publications = []
+    for publication in Publication.objects.only('id', 'title').iterator(chunk_size=1000):
+        publication.title_hash = hash_title(publication.title)
+        publications.append(publication)
+        if len(publications) >= 1000:
+            Publication.objects.bulk_update(publications, ['title_hash'])
+            publications = []
+    Publication.objects.bulk_update(publications, ['title_hash'])
+
+
+class Migration(migrations.Migration):
+    # backfill in autocommitted batches instead of holding the lock taken by AddField until every title is hashed
+    atomic = False
+
+    dependencies = [
+        ('citation', '0033_publicationauthors_corresponding_author'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='publication',
+            name='title_hash',
+            field=models.CharField(blank=True, editable=False, max_length=32,
+                                   help_text='BLAKE2b hash of the case and whitespace normalized title, used to find '
+                                             'duplicate publications'),
+        ),
+        migrations.RunPython(code=populate_title_hashes, reverse_code=migrations.RunPython.noop),
+    ]
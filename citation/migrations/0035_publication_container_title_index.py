@@ -0,0 +1,19 @@
+# Generated by Django 4.2.15 on 2026-10-16 12:40
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('citation', '0034_publication_title_hash'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='publication',
+            index=models.Index(fields=['container', 'title_hash'], name='citation_pub_container_title'),
+        ),
+    ]
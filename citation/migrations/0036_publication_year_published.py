@@ -0,0 +1,40 @@
+# Generated by Django 4.2.15 on 2026-10-16 13:10
+
+import re
+
+from django.db import migrations, models
+
+YEAR_PUBLISHED_REGEX = re.compile(r'(?<!\d)\d{4}(?!\d)')
+
+
+def parse_year_published(date_published_text):
+    r = YEAR_PUBLISHED_REGEX.search(date_published_text)
+    return int(r.group(0)) if r else None
+
+
+def populate_year_published(apps, schema_editor):
+    Publication = apps.get_model('citation', 'Publication')
+    publications = []
+    for publication in Publication.objects.only('id', 'date_published_text').iterator(chunk_size=5000):
+        publication.year_published = parse_year_published(publication.date_published_text)
+        publications.append(publication)
+        if len(publications) >= 5000:
+            Publication.objects.bulk_update(publications, ['year_published'])
+            publications = []
+    Publication.objects.bulk_update(publications, ['year_published'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('citation', '0035_publication_container_title_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='publication',
+            name='year_published',
+            field=models.PositiveSmallIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(code=populate_year_published, reverse_code=migrations.RunPython.noop),
+    ]
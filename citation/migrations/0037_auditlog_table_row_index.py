@@ -0,0 +1,20 @@
+# Generated by Django 4.2.15 on 2026-10-16 13:40
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # build the index without locking writes to the auditlog table
+    atomic = False
+
+    dependencies = [
+        ('citation', '0036_publication_year_published'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='auditlog',
+            index=models.Index(fields=['table', 'row_id'], name='citation_auditlog_table_row'),
+        ),
+    ]
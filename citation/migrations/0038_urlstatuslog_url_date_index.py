@@ -0,0 +1,19 @@
+# Generated by Django 4.2.15 on 2026-10-16 14:20
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('citation', '0037_auditlog_table_row_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='urlstatuslog',
+            index=models.Index(fields=['url', '-date_created'], name='citation_urlstatuslog_url_date'),
+        ),
+    ]
@@ -1,12 +1,15 @@
 import copy
+import json
 import logging
 import re
 import uuid
 from collections import defaultdict
 from datetime import datetime, date
 from enum import Enum
+from functools import lru_cache
+from hashlib import blake2b
 from typing import Dict, Optional, List
-from urllib3.util import parse_url
+from urllib.parse import urlsplit
 
 import requests
 from dateutil.parser import parser as datetime_parser, parse as datetime_parse
@@ -15,20 +18,21 @@ from django.contrib.auth.models import User
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.postgres.fields import JSONField, ArrayField
 from django.core.cache import cache
-from django.core.exceptions import FieldError
-from django.db import models, transaction
+from django.core.exceptions import FieldError, FieldDoesNotExist, ValidationError
+from django.db import models, transaction, IntegrityError
 from django.db.models import F
-from django.db.models import Q, IntegerField, Count, Max
+from django.db.models import Q, IntegerField, Count, Max, Exists, OuterRef
 from django.db.models.functions import Cast
 from django.template.defaultfilters import slugify
 from django.template.loader import get_template
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 from model_utils import Choices
 
 from . import fields
 from .graphviz.globals import CacheNames
-from .util import send_markdown_email
+from .util import send_markdown_email, NAME_TRANSLATION_TABLE
 
 logger = logging.getLogger(__name__)
 
@@ -72,8 +76,19 @@ def make_payload(instance):
     return payload
 
 
-def make_versioned_payload(instance, changes: Dict):
-    """Make an auditlog payload for an UPDATE statement"""
+def _get_related_instance(field, value, related_instances=None):
+    pk = getattr(value, 'pk', value)
+    if related_instances is not None and pk in related_instances.get(field.related_model, {}):
+        return related_instances[field.related_model][pk]
+    return field.related_model.objects.get(id=pk)
+
+
+def make_versioned_payload(instance, changes: Dict, related_instances: Optional[Dict] = None):
+    """Make an auditlog payload for an UPDATE statement
+
+    related_instances is an optional mapping of related model -> {pk: instance} used to look up the labels of
+    changed foreign keys without a query per change (see make_versioned_payload_batch)
+    """
     data = {}
     labels = {}
     for column_name, new_raw_value in changes.items():
@@ -85,7 +100,7 @@ def make_versioned_payload(instance, changes: Dict):
             data[field.name] = {'old': old_value, 'new': new_value}
             if field.many_to_one and field.related_model != User:
                 old_label = getattr(instance, field.name).get_message()
-                new_label = field.related_model.objects.get(id=new_value).get_message()
+                new_label = _get_related_instance(field, new_value, related_instances).get_message()
                 labels[field.name] = \
                     {'old': old_label, 'new': new_label}
 
@@ -99,97 +114,205 @@ def make_versioned_payload(instance, changes: Dict):
     return payload
 
 
+def make_versioned_payload_batch(instances, changes_per_instance):
+    """Make auditlog payloads for a batch of UPDATE statements
+
+    Changed foreign keys are fetched with one in_bulk query per related model instead of one query per change
+    """
+    related_ids_per_model = defaultdict(set)
+    for instance, changes in zip(instances, changes_per_instance):
+        for column_name, new_raw_value in changes.items():
+            field = instance._meta.get_field(column_name)
+            if field.many_to_one and field.related_model != User and new_raw_value is not None:
+                related_ids_per_model[field.related_model].add(getattr(new_raw_value, 'pk', new_raw_value))
+    related_instances = {related_model: related_model.objects.in_bulk(list(ids))
+                         for related_model, ids in related_ids_per_model.items()}
+    return [make_versioned_payload(instance, changes, related_instances=related_instances)
+            for instance, changes in zip(instances, changes_per_instance)]
+
+
+def _union(querysets: List[models.QuerySet], empty: models.QuerySet):
+    """UNION the given querysets, returning a plain queryset when there is only one and empty when there are none"""
+    if not querysets:
+        return empty
+    if len(querysets) == 1:
+        return querysets[0]
+    return querysets[0].union(*querysets[1:])
+
+
+def save_auditlogs(auditlogs: List['AuditLog'], auditlog_buffer: Optional[List['AuditLog']] = None):
+    """
+    Insert the auditlogs or, if an auditlog_buffer list is given, append them to it for its owner to insert with one
+    bulk_create in the same transaction
+    """
+    if auditlog_buffer is None:
+        AuditLog.objects.bulk_create(auditlogs, batch_size=1000)
+    else:
+        auditlog_buffer.extend(auditlogs)
+
+
 class LogManager(models.Manager):
     use_for_related_fields = True
 
-    def log_create(self, audit_command: 'AuditCommand', **kwargs):
+    def log_create(self, audit_command: 'AuditCommand', auditlog_buffer: Optional[List['AuditLog']] = None, **kwargs):
         with transaction.atomic():
             instance = self.create(**kwargs)
             audit_command.save_once()
-            AuditLog.objects.create(
+            save_auditlogs([AuditLog(
                 action='INSERT',
                 row_id=instance.id,
                 table=instance._meta.model_name,
                 payload=make_payload(instance),
-                audit_command=audit_command)
+                audit_command=audit_command)], auditlog_buffer)
             return instance
 
-    def log_get_or_create(self, audit_command: 'AuditCommand', **kwargs):
-        # relation_fields = {relation.attname for relation in self.model._meta.many_to_many}
+    def _is_unique_lookup(self, lookup: Dict):
+        """True if the lookup kwargs are non null values for exactly the fields of one unique constraint"""
+        meta = self.model._meta
+        if None in lookup.values():
+            return False
+        try:
+            lookup_fields = {meta.get_field(name) for name in lookup}
+        except FieldDoesNotExist:
+            return False
+        unique_field_sets = list(meta.unique_together) + \
+            [(field.name,) for field in meta.local_concrete_fields if field.unique and not field.primary_key]
+        return any({meta.get_field(name) for name in unique_field_names} == lookup_fields
+                   for unique_field_names in unique_field_sets)
+
+    def _create_or_get(self, defaults: Dict, **kwargs):
+        """
+        get_or_create that tries the INSERT first when kwargs cover a unique constraint, so a missing row is created
+        without the preceding SELECT and an existing one is only selected after the INSERT fails. Other lookups
+        use get_or_create. Both paths go through save() and send the model signals
+        """
+        if not self._is_unique_lookup(kwargs):
+            return self.get_or_create(defaults=defaults, **kwargs)
+        try:
+            with transaction.atomic(using=self.db):
+                return self.create(**{**kwargs, **defaults}), True
+        except IntegrityError:
+            try:
+                return self.get(**kwargs), False
+            except self.model.DoesNotExist:
+                # the INSERT failed for another reason than an existing row
+                pass
+            raise
+
+    def _get_or_create_with_auditlog(self, audit_command: 'AuditCommand', **kwargs):
+        """get_or_create an instance and build (but do not save) the AuditLog recording the change, if any"""
         publication = None
         if 'publication' in kwargs:
             publication = kwargs.pop('publication')
         defaults = kwargs.pop('defaults', {})
+        instance, created = self._create_or_get(defaults, **kwargs)
+        if created:
+            action = 'INSERT'
+            payload = make_payload(instance)
+        else:
+            action = 'UPDATE'
+            payload = make_versioned_payload(instance, kwargs)
+        auditlog = None
+        if created or payload:
+            audit_command.save_once()
+            auditlog = AuditLog(
+                action=action,
+                row_id=instance.id,
+                table=instance._meta.model_name,
+                payload=payload,
+                pub_id=publication,
+                audit_command=audit_command)
+        return instance, created, auditlog
+
+    def log_get_or_create(self, audit_command: 'AuditCommand', **kwargs):
         with transaction.atomic():
-            instance, created = self.get_or_create(defaults=defaults, **kwargs)
-            if created:
-                action = 'INSERT'
-                payload = make_payload(instance)
-                row_id = instance.id
-                pub_id = publication
-            else:
-                defaults.update(kwargs)
-                action = 'UPDATE'
-                payload = make_versioned_payload(instance, kwargs)
-                row_id = instance.id
-                pub_id = publication
-            if created or payload:
-                audit_command.save_once()
-                AuditLog.objects.create(
-                    action=action,
-                    row_id=row_id,
-                    table=instance._meta.model_name,
-                    payload=payload,
-                    pub_id=pub_id,
-                    audit_command=audit_command)
+            instance, created, auditlog = self._get_or_create_with_auditlog(audit_command, **kwargs)
+            if auditlog is not None:
+                auditlog.save()
 
         return instance, created
 
+    def bulk_log_get_or_create(self, audit_command: 'AuditCommand', rows: List[Dict],
+                               auditlog_buffer: Optional[List['AuditLog']] = None):
+        """
+        log_get_or_create every row (a dict of log_get_or_create keyword arguments) in a single transaction,
+        deferring the AuditLog inserts to one bulk_create
+
+        :return: list of (instance, created) tuples in the same order as rows
+        """
+        results = []
+        auditlogs = []
+        with transaction.atomic():
+            for row in rows:
+                instance, created, auditlog = self._get_or_create_with_auditlog(audit_command, **row)
+                if auditlog is not None:
+                    auditlogs.append(auditlog)
+                results.append((instance, created))
+            save_auditlogs(auditlogs, auditlog_buffer)
+        return results
+
 
 class LogQuerySet(models.QuerySet):
-    def log_delete(self, audit_command: 'AuditCommand'):
+    AUDITLOG_CHUNK_SIZE = 1000
+
+    def _iterate_in_chunks(self):
+        """
+        Stream instances from the database in lists of AUDITLOG_CHUNK_SIZE instead of loading the whole queryset,
+        joining in the related rows needed to label their auditlog payloads
+        """
+        related_names = [field.name for field in self.model._meta.concrete_fields
+                         if field.many_to_one and field.related_model != User]
+        chunk = []
+        for instance in self.select_related(*related_names).order_by('pk').iterator(
+                chunk_size=self.AUDITLOG_CHUNK_SIZE):
+            chunk.append(instance)
+            if len(chunk) == self.AUDITLOG_CHUNK_SIZE:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def log_delete(self, audit_command: 'AuditCommand', auditlog_buffer: Optional[List['AuditLog']] = None):
         # TODO test synchronization with solr
         """
         batch delete
         does not keep solr index in sync. must resync solr index after calling this method
         """
         with transaction.atomic():
-            instances = self.all()
             audit_command.save_once()
-            auditlogs = []
-            for instance in instances:
-                payload = make_payload(instance)
-                if payload:
-                    auditlogs.append(AuditLog(
-                        action='DELETE',
-                        row_id=instance.id,
-                        table=instance._meta.model_name,
-                        payload=payload,
-                        audit_command=audit_command))
-
-            AuditLog.objects.bulk_create(auditlogs)
-            instances.delete()
+            for instances in self._iterate_in_chunks():
+                auditlogs = []
+                for instance in instances:
+                    payload = make_payload(instance)
+                    if payload:
+                        auditlogs.append(AuditLog(
+                            action='DELETE',
+                            row_id=instance.id,
+                            table=instance._meta.model_name,
+                            payload=payload,
+                            audit_command=audit_command))
+                save_auditlogs(auditlogs, auditlog_buffer)
+            self.delete()
 
     def log_update(self, audit_command: 'AuditCommand', **kwargs):
         """batch update
         does not keep solr index in sync. must resync solr index after calling this method
         """
-        auditlogs = []
         with transaction.atomic():
-            instances = self.all()
             audit_command.save_once()
-            for instance in instances:
-                versioned_payload = make_versioned_payload(instance, kwargs)
-                if versioned_payload:
-                    auditlogs.append(AuditLog(
-                        action='UPDATE',
-                        row_id=instance.id,
-                        table=instance._meta.model_name,
-                        payload=versioned_payload,
-                        audit_command=audit_command))
-
-            AuditLog.objects.bulk_create(auditlogs)
-            instances.update(**kwargs)
+            for instances in self._iterate_in_chunks():
+                auditlogs = []
+                versioned_payloads = make_versioned_payload_batch(instances, [kwargs] * len(instances))
+                for instance, versioned_payload in zip(instances, versioned_payloads):
+                    if versioned_payload:
+                        auditlogs.append(AuditLog(
+                            action='UPDATE',
+                            row_id=instance.id,
+                            table=instance._meta.model_name,
+                            payload=versioned_payload,
+                            audit_command=audit_command))
+                AuditLog.objects.bulk_create(auditlogs)
+            self.update(**kwargs)
 
 
 class AbstractLogModel(models.Model):
@@ -215,18 +338,19 @@ class AbstractLogModel(models.Model):
             info = self.delete()
             return info
 
-    def log_update(self, audit_command: 'AuditCommand', **kwargs):
+    def log_update(self, audit_command: 'AuditCommand', auditlog_buffer: Optional[List['AuditLog']] = None,
+                   **kwargs):
         with transaction.atomic():
             payload = make_versioned_payload(self, kwargs)
             row_id = self.id
             if payload:
                 audit_command.save_once()
-                AuditLog.objects.create(
+                save_auditlogs([AuditLog(
                     action='UPDATE',
                     row_id=row_id,
                     table=self._meta.model_name,
                     payload=payload,
-                    audit_command=audit_command)
+                    audit_command=audit_command)], auditlog_buffer)
                 for column in kwargs:
                     setattr(self, column, kwargs[column])
                 self.save()
@@ -290,8 +414,7 @@ class Author(AbstractLogModel):
 
     @staticmethod
     def normalize_author_name(author_str: str):
-        normalized_name = re.sub(r"\n|\r", " ", author_str.strip())
-        normalized_name = re.sub(r"\.|,|\{|\}", "", normalized_name)
+        normalized_name = author_str.strip().translate(NAME_TRANSLATION_TABLE)
         normalized_name_split = normalized_name.split(' ', 1)
         if len(normalized_name_split) == 2:
             family, given = normalized_name_split
@@ -303,18 +426,24 @@ class Author(AbstractLogModel):
         return '{} {} ({})'.format(self.given_name, self.family_name, self.id)
 
     def duplicates(self, **kwargs):
-        criteria = Q()
+        """
+        Other authors, restricted by the kwargs filters, with this author's orcid, researcherid or email and family
+        name.
+
+        Returns a UNION queryset when more than one criterion applies. Only ordering, slicing, values and counting
+        work on it, a further filter() or exclude() raises NotSupportedError, pass filters as kwargs instead
+        """
+        # UNION of single criterion queries so that each branch can use its own (unique) index instead of a
+        # sequential scan over an OR
+        candidates = Author.objects.filter(**kwargs).exclude(id=self.id)
+        queries = []
         if self.email and self.family_name:
-            criteria |= (Q(email=self.email) & Q(family_name__iexact=self.family_name))
+            queries.append(candidates.filter(email=self.email, family_name__iexact=self.family_name))
         if self.orcid:
-            criteria |= Q(orcid=self.orcid)
+            queries.append(candidates.filter(orcid=self.orcid))
         if self.researcherid:
-            criteria |= Q(researcherid=self.researcherid)
-        if criteria.children:
-            query = Author.objects.filter(**kwargs).filter(criteria).exclude(id=self.id)
-        else:
-            query = Author.objects.none()
-        return query
+            queries.append(candidates.filter(researcherid=self.researcherid))
+        return _union(queries, empty=Author.objects.none())
 
 
 class AuthorAlias(AbstractLogModel):
@@ -405,6 +534,12 @@ class CodeArchiveStatus(Enum):
         return self.message
 
 
+@lru_cache(maxsize=None)
+def _get_email_template(template_name):
+    """Load and compile a correspondence email template once per process"""
+    return get_template(template_name)
+
+
 class AuthorCorrespondenceLog(models.Model):
     CODE_ARCHIVE_STATUS = Choices(
         *[(s.name, s.message) for s in CodeArchiveStatus]
@@ -470,7 +605,7 @@ class AuthorCorrespondenceLog(models.Model):
         correspondence_url = request.build_absolute_uri(self.get_absolute_url()) if request else self.get_absolute_url()
         context = dict(correspondence_url=correspondence_url, author_correspondence_log=self)
         # based on CodeArchivalStatus
-        template = get_template(self.get_email_template_path())
+        template = _get_email_template(self.get_email_template_path())
         return template.render(context)
 
     def send_email(self, request=None):
@@ -603,11 +738,21 @@ class Container(AbstractLogModel):
         return 'name: {} issn: {}'.format(repr(self.name), repr(self.issn) if self.issn else '\'\'')
 
     def duplicates(self):
-        return Container.objects \
-            .filter((Q(issn=self.issn) & Q(issn__isnull=False)) |
-                    (Q(eissn=self.issn) & Q(eissn__isnull=False)) |
-                    (Q(name=self.name) & ~Q(name=''))) \
-            .exclude(id=self.id)
+        """
+        Other containers with this container's issn as their issn or eissn, or with the same name. Empty issns and
+        names match nothing.
+
+        Returns a UNION queryset when more than one criterion applies. Only ordering, slicing, values and counting
+        work on it, a further filter() or exclude() raises NotSupportedError
+        """
+        candidates = Container.objects.exclude(id=self.id)
+        queries = []
+        if self.issn:
+            queries.append(candidates.filter(issn=self.issn))
+            queries.append(candidates.filter(eissn=self.issn))
+        if self.name:
+            queries.append(candidates.filter(name=self.name))
+        return _union(queries, empty=Container.objects.none())
 
 
 class ContainerAlias(AbstractLogModel):
@@ -625,7 +770,43 @@ class ContainerAlias(AbstractLogModel):
         unique_together = ('container', 'name')
 
 
+@lru_cache(maxsize=4096)
+def parse_date_published_text(date_published_text: str) -> Optional[date]:
+    """
+    Parse free text publication dates, memoized since the same few thousand strings are parsed repeatedly when
+    aggregating publications. Bare years and ISO 8601 dates (the common cases) skip the much slower dateutil parser.
+    Bare years are parsed as January 1st of that year.
+    """
+    text = date_published_text.strip()
+    if len(text) == 4 and text.isdigit():
+        return date(int(text), 1, 1) if int(text) > 0 else None
+    try:
+        return datetime.fromisoformat(text).date()
+    except ValueError:
+        pass
+    try:
+        return datetime_parse(text).date()
+    except (ValueError, OverflowError):
+        return None
+
+
+YEAR_PUBLISHED_REGEX = re.compile(r'(?<!\d)\d{4}(?!\d)')
+
+
+def parse_year_published(date_published_text: str) -> Optional[int]:
+    """Return the first four digit year in date_published_text or None"""
+    r = YEAR_PUBLISHED_REGEX.search(date_published_text)
+    return int(r.group(0)) if r else None
+
+
+def hash_title(title: str) -> str:
+    """Hash a publication title so that titles differing only in case or whitespace have the same hash"""
+    normalized_title = ' '.join(title.split()).casefold()
+    return blake2b(normalized_title.encode('utf-8'), digest_size=16).hexdigest()
+
+
 class PublicationQuerySet(models.QuerySet):
+    CITATION_STRING_FIELDS = ('id', 'title', 'year_published', 'volume', 'pages', 'container', 'container__name')
 
     def primary(self, prefetch=False, **kwargs):
         if 'is_primary' in kwargs:
@@ -639,6 +820,47 @@ class PublicationQuerySet(models.QuerySet):
     def reviewed(self, **kwargs):
         return self.filter(status=Publication.Status.REVIEWED, **kwargs)
 
+    def with_is_archived(self):
+        """
+        Annotate Publication.is_archived with an EXISTS subquery so that listing publications does not issue an
+        exists() query per publication
+        """
+        return self.annotate(annotated_is_archived=Exists(
+            CodeArchiveUrl.objects.filter(publication_id=OuterRef('pk')).exclude(
+                status=CodeArchiveUrl.STATUS.unavailable)))
+
+    def with_display_fields(self):
+        """
+        Fetch the related rows read by Publication.slug, apa_citation_string and container_title up front so that
+        rendering a list of publications does not issue queries per publication
+        """
+        return self.select_related('container').prefetch_related(
+            models.Prefetch('creators', queryset=Author.objects.only('id', 'given_name', 'family_name')))
+
+    def for_citation_string(self):
+        """
+        Load only the columns read by Publication.slug, apa_citation_string and container_title, leaving out the wide
+        abstract, zotero metadata and text columns
+        """
+        return self.with_display_fields().only(*self.CITATION_STRING_FIELDS)
+
+    def for_list(self):
+        """
+        Load only the columns needed to render a publication in a listing
+        """
+        # a later only() call replaces the deferred field set of an earlier one so the fields are listed in full here
+        return self.with_display_fields().only(*self.CITATION_STRING_FIELDS, 'doi', 'is_primary', 'date_modified')
+
+    def for_detail(self):
+        """
+        Fetch the related rows rendered by PublicationSerializer up front so that serializing a publication issues a
+        fixed number of queries
+        """
+        return self.select_related('container', 'assigned_curator').prefetch_related(
+            'creators', 'tags', 'sponsors', 'platforms', 'model_documentation',
+            models.Prefetch('code_archive_urls', queryset=CodeArchiveUrl.objects.select_related('category')),
+            models.Prefetch('note_set', queryset=Note.objects.select_related('added_by', 'deleted_by')))
+
     def annotate_code_availability(self):
         """
         A publication is considered to have its code available if has at least one CodeArchiveUrl and all its
@@ -684,12 +906,11 @@ class PublicationQuerySet(models.QuerySet):
             return FieldError
 
     def has_no_archive_urls(self):
-        return self.annotate(code_archive_urls_count=models.Count('code_archive_urls')).filter(
-            code_archive_urls_count=0)
+        return self.filter(~Exists(CodeArchiveUrl.objects.filter(publication_id=OuterRef('pk'))))
 
     def has_unavailable_archive_urls(self):
-        return self.annotate(unavailable_archive_urls=models.Count('code_archive_urls', filter=models.Q(
-            code_archive_urls__status='unavailable')))
+        return self.filter(Exists(CodeArchiveUrl.objects.filter(publication_id=OuterRef('pk'),
+                                                                status=CodeArchiveUrl.STATUS.unavailable)))
 
     def no_code_available(self, **kwargs):
         return self.primary(**kwargs).reviewed().with_code_availability_counts().filter(has_available_code=False)
@@ -730,21 +951,17 @@ class PublicationQuerySet(models.QuerySet):
         ).order_by(order_by)
 
     def with_code_availability_counts(self):
+        """
+        Annotates has_available_code: True if a publication has at least one available or restricted CodeArchiveUrl
+        and no unavailable CodeArchiveUrls
+        """
+        code_archive_urls = CodeArchiveUrl.objects.filter(publication_id=OuterRef('pk'))
+        available = Exists(code_archive_urls.filter(
+            status__in=(CodeArchiveUrl.STATUS.available, CodeArchiveUrl.STATUS.restricted)))
+        unavailable = Exists(code_archive_urls.filter(status=CodeArchiveUrl.STATUS.unavailable))
         return self.annotate(
-            available_code_archive_urls_count=models.Count(
-                'code_archive_urls',
-                filter=models.Q(code_archive_urls__status__in=('available', 'restricted')))
-        ).annotate(
-            unavailable_code_archive_urls_count=models.Count(
-                'code_archive_urls',
-                filter=models.Q(code_archive_urls__status='unavailable'))
-        ).annotate(
-            has_available_code=models.Case(
-                models.When(models.Q(available_code_archive_urls_count__gt=0) &
-                            models.Q(unavailable_code_archive_urls_count=0),
-                            then=models.Value(True)),
-                default=models.Value(False),
-                output_field=models.BooleanField())
+            has_available_code=models.ExpressionWrapper(Q(available) & ~Q(unavailable),
+                                                        output_field=models.BooleanField())
         )
 
 
@@ -763,6 +980,8 @@ class Publication(AbstractLogModel):
     zotero_key = models.CharField(max_length=64, null=True, unique=True, blank=True)
     url = models.URLField(blank=True)
     date_published_text = models.CharField(max_length=64, blank=True)
+    # derived from date_published_text on save
+    year_published = models.PositiveSmallIntegerField(null=True, blank=True, db_index=True, editable=False)
     date_accessed = models.DateField(null=True, blank=True)
     # FIXME: remove unused Zotero metadata at some point since we are no longer importing from Zotero
     archive = models.CharField(max_length=255, blank=True)
@@ -826,9 +1045,30 @@ class Publication(AbstractLogModel):
         "self", symmetrical=False, related_name="referenced_by",
         through='PublicationCitations', through_fields=('publication', 'citation'))
 
+    title_hash = models.CharField(max_length=32, blank=True, editable=False,
+                                  help_text=_('BLAKE2b hash of the case and whitespace normalized title, used to '
+                                              'find duplicate publications'))
+
     objects = LogManager.from_queryset(LogQuerySet)()
     api = PublicationQuerySet.as_manager()
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self.title_hash = hash_title(self.title)
+            self.year_published = parse_year_published(self.date_published_text)
+        else:
+            # only derive the columns whose source is being saved, the source may not even be loaded
+            update_fields = set(update_fields)
+            if 'title' in update_fields:
+                self.title_hash = hash_title(self.title)
+                update_fields.add('title_hash')
+            if 'date_published_text' in update_fields:
+                self.year_published = parse_year_published(self.date_published_text)
+                update_fields.add('year_published')
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+
     def duplicates(self, query=None, container=None, **kwargs):
         criteria = (Q(isi=self.isi) & Q(isi__isnull=False)) | \
                    (Q(doi=self.doi) & Q(doi__isnull=False))
@@ -836,11 +1076,11 @@ class Publication(AbstractLogModel):
         if container is not None:
             if container.id is not None:
                 criteria |= (Q(container_id=container.id) &
-                             Q(title__iexact=self.title) &
+                             Q(title_hash=hash_title(self.title)) &
                              ~Q(title=''))
             elif container.issn:
                 criteria |= (Q(container__issn=container.issn) &
-                             Q(title__iexact=self.title) &
+                             Q(title_hash=hash_title(self.title)) &
                              ~Q(title=''))
 
         if query is None:
@@ -859,6 +1099,9 @@ class Publication(AbstractLogModel):
 
     @property
     def is_archived(self):
+        if 'annotated_is_archived' in self.__dict__:
+            # set by PublicationQuerySet.with_is_archived
+            return self.annotated_is_archived
         return self.code_archive_urls.exclude(status=CodeArchiveUrl.STATUS.unavailable).exists()
 
     @property
@@ -873,23 +1116,34 @@ class Publication(AbstractLogModel):
 
     @property
     def contributor_data_cache_key(self):
-        return "{0}{1}".format(CacheNames.CONTRIBUTION_DATA.value, self.pk)
+        return f"{CacheNames.CONTRIBUTION_DATA.value}{self.pk}"
 
     def contributor_data(self, latest=False):
-        value = cache.get(self.contributor_data_cache_key)
+        cache_key = self.contributor_data_cache_key
+        value = cache.get(cache_key)
         if value is not None and not latest:
             return value
         elif self.is_primary:
-            logs = AuditLog.objects.get_contributor_data(self)
-            cache.set(self.contributor_data_cache_key, list(logs), 86410)
+            logs = list(AuditLog.objects.get_contributor_data(self))
+            cache.set(cache_key, logs, 86410)
             return logs
         return []
 
+    def get_year_published(self) -> Optional[int]:
+        """
+        year_published is only derived from date_published_text in save(), parse it for unsaved publications such as
+        the detached ones built by the bibtex and crossref importers
+        """
+        if self.year_published is None and self._state.adding:
+            return parse_year_published(self.date_published_text)
+        return self.year_published
+
     @property
     def slug(self):
         year_str = None
-        if self.year_published is not None:
-            year_str = str(self.year_published)
+        year_published = self.get_year_published()
+        if year_published is not None:
+            year_str = str(year_published)
         apa_authors = '-'.join(['{0} {1}'.format(c.given_name, c.family_name) for c in self.creators.all()])
         slug_text = self.slugify_max("-".join([x for x in [apa_authors, year_str, self.title] if x]), 100)
         return slug_text
@@ -928,17 +1182,7 @@ class Publication(AbstractLogModel):
 
     @property
     def date_published(self):
-        try:
-            return datetime_parse(self.date_published_text).date()
-        except ValueError:
-            return None
-
-    YEAR_PUBLISHED_REGEX = re.compile(r'(?<!\d)\d{4}(?!\d)')
-
-    @property
-    def year_published(self):
-        r = self.YEAR_PUBLISHED_REGEX.search(self.date_published_text)
-        return r.group(0) if r else None
+        return parse_date_published_text(self.date_published_text)
 
     @property
     def container_title(self):
@@ -948,7 +1192,7 @@ class Publication(AbstractLogModel):
         apa_authors = ', '.join(['{0}, {1}.'.format(c.family_name, c.given_name_initial) for c in self.creators.all()])
         return "{0} ({1}). {2}. {3}, {4}({5})".format(
             apa_authors,
-            self.year_published,
+            self.get_year_published(),
             self.title,
             self.container_title,
             self.volume,
@@ -960,9 +1204,16 @@ class Publication(AbstractLogModel):
         return reverse('core:public-publication-detail', kwargs={'pk': self.pk})
 
     def __str__(self):
-        return 'id: {id} {title} {year}. {container}'.format(id=self.id, title=self.title, year=self.year_published,
+        return 'id: {id} {title} {year}. {container}'.format(id=self.id, title=self.title,
+                                                             year=self.get_year_published(),
                                                              container=self.container)
 
+    class Meta:
+        indexes = [
+            # supports the container / title criteria in duplicates()
+            models.Index(fields=['container', 'title_hash'], name='citation_pub_container_title'),
+        ]
+
 
 class CodeArchiveUrlCategory(models.Model):
     category = models.CharField(max_length=150)
@@ -1018,9 +1269,60 @@ class Match:
         return self.value
 
 
+class CodeArchiveUrlMatcher:
+    """
+    Categorizes urls with an ordered list of CodeArchiveUrlPatterns (as returned by with_matchers). Every host regex
+    is combined into one compiled alternation so a url's host is scanned once instead of once per pattern. The first
+    alternative to match is the highest priority pattern whose host matches; its path matcher is then checked and
+    the remaining patterns are only tried one at a time if the path does not match. Code archive urls share a small
+    number of hosts so the result of the host scan is remembered per host
+    """
+
+    HOST_CACHE_SIZE = 4096
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        # bounded since hosts come from user entered urls
+        self._first_host_match = lru_cache(maxsize=self.HOST_CACHE_SIZE)(self._scan_host)
+        try:
+            self.host_matcher = re.compile('|'.join(
+                '(?P<p{}>{})'.format(i, pattern.regex_host_matcher) for i, pattern in enumerate(self.patterns)))
+        except re.error:
+            # e.g., patterns using numbered backreferences or inline flags cannot be combined
+            logger.warning('Unable to combine code archive url host patterns, matching one pattern at a time')
+            self.host_matcher = None
+
+    def _scan_host(self, host):
+        """Return the index of the first pattern whose host regex matches host"""
+        if self.host_matcher is None:
+            return 0
+        match = self.host_matcher.match(host)
+        # without any patterns the combined regex is empty and matches without a group
+        return len(self.patterns) if match is None or match.lastgroup is None else int(match.lastgroup[1:])
+
+    def match(self, host, path):
+        """Return the first pattern matching host and path or None"""
+        host = host or ''
+        path = path or ''
+        start = self._first_host_match(host)
+        if self.host_matcher is not None and start < len(self.patterns):
+            # the combined regex already matched this pattern's host
+            pattern = self.patterns[start]
+            if pattern.path_matcher.match(path):
+                return pattern
+            start += 1
+        for pattern in self.patterns[start:]:
+            if pattern.host_matcher.match(host) and pattern.path_matcher.match(path):
+                return pattern
+        return None
+
+    def __len__(self):
+        return len(self.patterns)
+
+
 class CodeArchiveUrlPatternQuerySet(models.QuerySet):
     def with_matchers(self):
-        qs = self.exclude(regex_host_matcher='', regex_path_matcher='')
+        qs = self.exclude(regex_host_matcher='', regex_path_matcher='').order_by('id')
         patterns = list(qs)
         for pattern in patterns:
             pattern.host_matcher = re.compile(
@@ -1037,10 +1339,30 @@ class CodeArchiveUrlPattern(models.Model):
 
     objects = CodeArchiveUrlPatternQuerySet.as_manager()
 
+    def clean(self):
+        # an invalid regex would break building the url matcher for every url
+        errors = {}
+        for field_name in ('regex_host_matcher', 'regex_path_matcher'):
+            try:
+                re.compile(getattr(self, field_name))
+            except re.error as e:
+                errors[field_name] = _('Invalid regular expression: %(error)s') % {'error': e}
+        if errors:
+            raise ValidationError(errors)
+
     def __str__(self):
         return f'category={self.category_id} regex_host_matcher={repr(self.regex_host_matcher)} regex_path_matcher={repr(self.regex_path_matcher)}'
 
 
+@lru_cache(maxsize=1)
+def get_code_archive_url_matcher():
+    """
+    Return a CodeArchiveUrlMatcher for every CodeArchiveUrlPattern, compiled once per process and cleared by the
+    CodeArchiveUrlPattern / CodeArchiveUrlCategory save and delete signal handlers in citation.signals
+    """
+    return CodeArchiveUrlMatcher(CodeArchiveUrlPattern.objects.select_related('category').with_matchers())
+
+
 class CodeArchiveUrlQuerySet(LogQuerySet):
 
     def active(self, **kwargs):
@@ -1048,15 +1370,14 @@ class CodeArchiveUrlQuerySet(LogQuerySet):
 
     def code_archive_status(self, **kwargs):
         aggregate_status = None
-        qs = self.active(**kwargs)
-        if qs.exists():
-            for code_archive_url in self.active(**kwargs):
-                url_status = code_archive_url.code_archive_status
-                if aggregate_status is None or aggregate_status < url_status:
-                    aggregate_status = url_status
-            return aggregate_status
-
-        return CodeArchiveStatus.NOT_AVAILABLE
+        # one query for the urls and their categories, read by CodeArchiveUrl.code_archive_status
+        for code_archive_url in self.active(**kwargs).select_related('category'):
+            url_status = code_archive_url.code_archive_status
+            if aggregate_status is None or aggregate_status < url_status:
+                aggregate_status = url_status
+        if aggregate_status is None:
+            return CodeArchiveStatus.NOT_AVAILABLE
+        return aggregate_status
 
 
 class CodeArchiveUrl(AbstractLogModel):
@@ -1085,6 +1406,14 @@ class CodeArchiveUrl(AbstractLogModel):
 
     api = CodeArchiveUrlQuerySet.as_manager()
 
+    # Method Not Allowed, Not Implemented
+    HEAD_NOT_ALLOWED_STATUS_CODES = (405, 501)
+    # (connect, read) timeouts in seconds: fail fast on unreachable hosts but give slow servers time to respond.
+    # Overridden by the CITATION_PING_TIMEOUT setting
+    DEFAULT_PING_TIMEOUT = (3, 7)
+    # the fields make_url_status_log may change
+    URL_STATUS_FIELDS = ['status', 'category', 'last_modified']
+
     @property
     def code_archive_status(self):
         if self.status == CodeArchiveUrl.STATUS.available and self.category.trusted:
@@ -1096,24 +1425,56 @@ class CodeArchiveUrl(AbstractLogModel):
             # remaining option is (1) restricted access or (2) available but not in a "trusted" repository
             return CodeArchiveStatus.NOT_IN_ARCHIVE
 
-    def check_status(self, patterns, fallback_category):
-        url = self.url
-        category = CodeArchiveUrl.categorize_url(url, patterns, fallback_category=fallback_category)
+    def check_status(self, matcher: CodeArchiveUrlMatcher, fallback_category, session=requests):
+        category = CodeArchiveUrl.categorize_url(self.url, matcher, fallback_category=fallback_category)
+        self.add_url_status_log(category, self.ping(session))
+
+    def ping(self, session=requests):
+        """
+        Request this url without touching the database (safe to call from worker threads) and return the response,
+        including error responses, or None if no response was received
+        """
+        timeout = getattr(settings, 'CITATION_PING_TIMEOUT', self.DEFAULT_PING_TIMEOUT)
         try:
-            # HEAD requests hang on some URLs so using GET for now
-            response = requests.get(url, timeout=3)
-            response.raise_for_status()
-            self.add_url_status_log(category, response)
+            try:
+                response = session.head(self.url, timeout=timeout, allow_redirects=True)
+                head_supported = response.status_code not in CodeArchiveUrl.HEAD_NOT_ALLOWED_STATUS_CODES
+            except requests.exceptions.ReadTimeout:
+                # some servers accept the connection but never answer a HEAD request
+                head_supported = False
+            if not head_supported:
+                # fall back to a GET but never read the body
+                response = session.get(self.url, timeout=timeout, stream=True)
+                response.close()
+            # error status codes are classified by get_status_choice, no need to raise and catch an HTTPError
+            return response
+        except requests.exceptions.Timeout:
+            logger.info('Timed out requesting %s', self.url)
+            return None
         except requests.exceptions.RequestException as err:
-            self.add_url_status_log(category, err.response)
+            return err.response
 
     def add_url_status_log(self, category, response):
+        url_status_log, changed = self.make_url_status_log(category, response)
+        with transaction.atomic():
+            url_status_log.save()
+            if changed:
+                self.save(update_fields=self.URL_STATUS_FIELDS)
+
+    def make_url_status_log(self, category, response):
+        """
+        Apply the status and category from a ping to this CodeArchiveUrl in memory only
+
+        :return: an unsaved URLStatusLog and True if this CodeArchiveUrl changed and still needs to be saved
+        """
         response_status = CodeArchiveUrl.get_status_choice(response)  # corresponds to the status Choices
 
-        URLStatusLog.objects.create(status_code=response.status_code,
-                                    publication=self.publication,
-                                    status_reason=response.reason, headers=response.headers,
-                                    url=self.url)
+        url_status_log = URLStatusLog(status_code=response.status_code if response is not None else 0,
+                                      publication_id=self.publication_id,
+                                      status_reason=response.reason if response is not None else '',
+                                      headers=URLStatusLog.serialize_headers(response.headers)
+                                      if response is not None else '',
+                                      url=self.url)
         changes = {}
         if self.status != response_status:
             changes['status'] = {'old': self.status, 'new': response_status}
@@ -1122,13 +1483,19 @@ class CodeArchiveUrl(AbstractLogModel):
             changes['category'] = {'old': self.category, 'new': category}
             self.category = category
         if changes:
-            logger.info('URL status (%s): %s %s', self.publication.title[:25], self.url, changes)
-            self.save()
+            if logger.isEnabledFor(logging.INFO):
+                logger.info('URL status (%s): %s %s', self.publication.title[:25], self.url, changes)
+            # bulk_update does not apply auto_now
+            self.last_modified = timezone.now()
+        return url_status_log, bool(changes)
 
     @classmethod
     def get_status_choice(cls, response):
         # FIXME: consider doing more fine-grained checking on the response
-        if response:
+        if response is None:
+            # the request failed without a response, e.g. a connection error
+            return CodeArchiveUrl.STATUS.unavailable
+        elif response:
             return CodeArchiveUrl.STATUS.available
         elif response.status_code == 403:
             return CodeArchiveUrl.STATUS.restricted
@@ -1136,22 +1503,22 @@ class CodeArchiveUrl(AbstractLogModel):
             return CodeArchiveUrl.STATUS.unavailable
 
     @classmethod
-    def categorize_url(cls, url, patterns, fallback_category):
+    def categorize_url(cls, url, matcher: CodeArchiveUrlMatcher, fallback_category):
         """
         Categorize the url depending on the server name into following categories
         CoMSES, Open Source, Platforms, Journal, Personal, Others, and Invalid
         """
-        parsed_url = parse_url(url)
-        host = parsed_url.host
-        path = parsed_url.path
-
-        for pattern in patterns:
-            host_matcher = pattern.host_matcher
-            path_matcher = pattern.path_matcher
-
-            if host_matcher.match(host) and path_matcher.match(path):
-                logger.info('Categorized url %s as %s', url, pattern.category)
-                return pattern.category
+        # treat scheme-less urls like www.example.com/model as starting with a host
+        try:
+            parsed_url = urlsplit(url if '://' in url else '//' + url)
+            host, path = parsed_url.hostname, parsed_url.path
+        except ValueError:
+            # e.g., a malformed IPv6 host
+            host, path = None, None
+        pattern = matcher.match(host, path)
+        if pattern is not None:
+            logger.info('Categorized url %s as %s', url, pattern.category)
+            return pattern.category
         logger.info('Categorized url %s as %s', url, fallback_category)
         return fallback_category
 
@@ -1183,6 +1550,19 @@ class URLStatusLog(models.Model):
     status_reason = models.TextField(blank=True, help_text=_('contains reason for the url success/failure'))
     system_generated = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = [
+            # the most recent log for a url, see ping_urls.verify_url_status
+            models.Index(fields=['url', '-date_created'], name='citation_urlstatuslog_url_date'),
+        ]
+
+    # response headers worth keeping, the rest (cookies, security policies, ...) can run to several KB per response
+    RECORDED_HEADERS = frozenset(['content-type', 'content-length', 'last-modified', 'etag', 'server', 'location'])
+
+    @classmethod
+    def serialize_headers(cls, headers) -> str:
+        return json.dumps({k: v for k, v in headers.items() if k.lower() in cls.RECORDED_HEADERS})
+
     def get_message(self):
         return "Pub: {pub} {url} {code} {reason}".format(pub=self.publication,
                                                          url=self.url,
@@ -1229,8 +1609,10 @@ class AuditLogQuerySet(models.QuerySet):
                                                  Q(pub_id=publication.id))) \
             .annotate(creator=F('audit_command__creator__username')).values('creator').order_by('creator')
 
+        # COUNT(*) in the database instead of len() which fetches every auditlog row
+        total = audit_logs.count() or 1
         unique_logs = audit_logs.annotate(
-            contribution=(Cast((Count('creator')) * 100 / len(audit_logs), IntegerField())),
+            contribution=(Cast((Count('creator')) * 100 / total, IntegerField())),
             date_added=(Max('audit_command__date_added'))) \
             .values('creator', 'contribution', 'date_added').order_by('-date_added')
 
@@ -1277,6 +1659,11 @@ class AuditLog(models.Model):
 
     class Meta:
         ordering = ['-id']
+        indexes = [
+            # history lookups by (table, row_id) in get_contributor_data and the activity logs. pub_id and
+            # audit_command are already indexed as foreign keys
+            models.Index(fields=['table', 'row_id'], name='citation_auditlog_table_row'),
+        ]
 
 
 class Raw(AbstractLogModel):
@@ -1466,20 +1853,23 @@ class SuggestedMerge(AbstractLogModel):
 
     @classmethod
     def annotate_names(cls, instances: List['SuggestedMerge']):
-        model_lookups = defaultdict(list)
+        model_lookups = defaultdict(set)
         model_class_to_indices = defaultdict(list)
         for i, instance in enumerate(instances):
-            model_class = instance.content_type.model_class()
-            model_lookups[model_class] += instance.duplicates
+            # get_for_id is served from the ContentType manager's cache instead of fetching each content_type row
+            model_class = ContentType.objects.get_for_id(instance.content_type_id).model_class()
+            # suggested merges of the same model often share duplicates so only look up each pk once
+            model_lookups[model_class].update(instance.duplicates)
 
             model_class_to_indices[model_class].append(i)
 
         for model, ids in model_lookups.items():
-            pk_to_related_instances = model.objects.filter(id__in=ids).in_bulk()
+            get_related_instance = model.objects.in_bulk(list(ids)).get
             matching_instances = [instances[ind] for ind in model_class_to_indices[model]]
             for instance_match in matching_instances:
-                instance_match.duplicate_instances = [pk_to_related_instances[pk] for pk in instance_match.duplicates
-                                                      if pk in pk_to_related_instances]
+                instance_match.duplicate_instances = [related_instance for related_instance in
+                                                      map(get_related_instance, instance_match.duplicates)
+                                                      if related_instance is not None]
         return instances
 
     @property
@@ -1,19 +1,185 @@
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial
+from itertools import islice
+from urllib.parse import urlsplit
 
-from .models import CodeArchiveUrl, CodeArchiveUrlPattern, CodeArchiveUrlCategory
+import requests
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.functions import Mod
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .models import CodeArchiveUrl, CodeArchiveUrlCategory, URLStatusLog, get_code_archive_url_matcher
 
 logger = logging.getLogger(__name__)
 
+MAX_WORKERS = 32
+BATCH_SIZE = 500
+# a URLStatusLog is only written for an unchanged url if its last log is older than this
+URL_STATUS_LOG_HEARTBEAT = timedelta(days=7)
+# concurrent requests to the same host, more than a few get rate limited by e.g. github.com
+MAX_REQUESTS_PER_HOST = 4
+# seconds to skip a host for after a request to it got no response
+UNREACHABLE_HOST_TTL = 120
+
+
+def create_session(pool_size=64):
+    """ a requests Session with a connection pool large enough to be shared by every worker thread """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                          # retry connection failures and rate limited requests with a short backoff instead of the
+                          # server's Retry-After delay, which could hold a worker for minutes, and return the last
+                          # response rather than raising when retries run out. Read timeouts are not retried, a
+                          # host that accepted the connection but did not answer in time would cost another full
+                          # read timeout per retry
+                          max_retries=Retry(total=2, connect=2, read=0, backoff_factor=0.3, status_forcelist=(429,),
+                                            raise_on_status=False, respect_retry_after_header=False))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+SESSION = create_session()
+
+
+# returned by ping_url instead of a response for urls that were not requested
+SKIPPED = object()
+
+
+def get_host(url):
+    try:
+        return urlsplit(url).hostname
+    except ValueError:
+        return None
+
+
+class HostThrottle:
+    """
+    Per host request limits for one verify_url_status run: at most MAX_REQUESTS_PER_HOST concurrent requests to a host
+    and none for UNREACHABLE_HOST_TTL seconds after a request to it got no response
+    """
+
+    def __init__(self, max_requests_per_host=MAX_REQUESTS_PER_HOST):
+        self.max_requests_per_host = max_requests_per_host
+        self._semaphores = {}
+        self._lock = threading.Lock()
+        # host -> time.monotonic() until which requests to it are skipped
+        self._unreachable_until = {}
+
+    def semaphore(self, host):
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = self._semaphores[host] = threading.BoundedSemaphore(self.max_requests_per_host)
+        return semaphore
+
+    def is_unreachable(self, host):
+        return host is not None and self._unreachable_until.get(host, 0) > time.monotonic()
+
+    def mark_unreachable(self, host):
+        if host is not None:
+            self._unreachable_until[host] = time.monotonic() + UNREACHABLE_HOST_TTL
+
+
+def ping_url(code_archive_url, throttle, session=SESSION):
+    """
+    :return: (code_archive_url, response), the response is None if no response was received and SKIPPED if the url
+    was not requested since its host did not respond recently
+    """
+    host = get_host(code_archive_url.url)
+    with throttle.semaphore(host):
+        # checked after waiting for the semaphore since the requests ahead of this one may have just failed
+        if throttle.is_unreachable(host):
+            logger.info("Skipping %s, %s did not respond recently", code_archive_url.url, host)
+            return code_archive_url, SKIPPED
+        response = code_archive_url.ping(session)
+    if response is None:
+        throttle.mark_unreachable(host)
+    return code_archive_url, response
+
+
+def get_last_logged(code_archive_urls):
+    """ :return: a dict of url -> date of the latest URLStatusLog for the given CodeArchiveUrls """
+    return dict(URLStatusLog.objects.filter(url__in={code_archive_url.url for code_archive_url in code_archive_urls})
+                .values_list('url').annotate(Max('date_created')).order_by())
+
+
+def save_url_status_logs(url_status_logs, changed_code_archive_urls):
+    with transaction.atomic():
+        URLStatusLog.objects.bulk_create(url_status_logs, batch_size=BATCH_SIZE)
+        CodeArchiveUrl.objects.bulk_update(changed_code_archive_urls, CodeArchiveUrl.URL_STATUS_FIELDS,
+                                           batch_size=BATCH_SIZE)
+
+
+def check_code_archive_urls(code_archive_urls, executor, session, matcher, fallback_category, throttle):
+    """
+    pings one batch of CodeArchiveUrls on the executor and saves their status logs and changes. Only the HTTP
+    requests run in the worker threads, database writes stay on the calling thread. Skipped urls are left as they are
+    and checked again on the next run
+    """
+    url_status_logs = []
+    changed_code_archive_urls = []
+    last_logged = get_last_logged(code_archive_urls)
+    heartbeat = timezone.now() - URL_STATUS_LOG_HEARTBEAT
+    for code_archive_url, response in executor.map(partial(ping_url, throttle=throttle, session=session),
+                                                   code_archive_urls):
+        if response is SKIPPED:
+            continue
+        logger.info("Checking status of %s", code_archive_url.url)
+        category = CodeArchiveUrl.categorize_url(code_archive_url.url, matcher, fallback_category=fallback_category)
+        url_status_log, changed = code_archive_url.make_url_status_log(category, response)
+        if changed:
+            changed_code_archive_urls.append(code_archive_url)
+        # most urls do not change between runs, only log state changes and a periodic heartbeat
+        last_logged_date = last_logged.get(code_archive_url.url)
+        if changed or last_logged_date is None or last_logged_date < heartbeat:
+            url_status_logs.append(url_status_log)
+    save_url_status_logs(url_status_logs, changed_code_archive_urls)
+
+
+def verify_url_status(max_workers=MAX_WORKERS, max_seconds=None, shards=1, shard_index=0, start_id=None):
+    """
+    requests all CodeArchiveUrls to check their status, max_workers at a time. If max_seconds is given no new batch of
+    urls is started once that much time has passed. With shards > 1 only the CodeArchiveUrls whose id modulo shards is
+    shard_index are checked so that several processes can split the work.
 
-def verify_url_status():
-    """ requests all CodeArchiveUrls to check their status """
-    code_archive_urls = CodeArchiveUrl.objects.all()
-    patterns = CodeArchiveUrlPattern.objects.select_related('category').with_matchers()
+    CodeArchiveUrls are checked in id order and the last id of every saved batch is logged, an interrupted run can be
+    resumed by passing the logged id as start_id
+    """
+    # load only what ping and make_url_status_log read, publication title and category are used in its log message.
+    # The creator's username is loaded too since CodeArchiveUrl.__str__ includes it
+    code_archive_urls = CodeArchiveUrl.objects.select_related('publication', 'category', 'creator') \
+        .only('id', 'url', 'status', 'system_overridable_category', 'category', 'publication__title',
+              'creator__username') \
+        .order_by('id')
+    if shards > 1:
+        code_archive_urls = code_archive_urls.alias(shard=Mod('id', shards)).filter(shard=shard_index)
+    if start_id is not None:
+        code_archive_urls = code_archive_urls.filter(id__gt=start_id)
+    code_archive_urls = code_archive_urls.iterator(chunk_size=BATCH_SIZE)
+    matcher = get_code_archive_url_matcher()
     fallback_category = CodeArchiveUrlCategory.objects.get(category='Unknown')
     logger.info("Verifying URL status for all CodeArchiveURLs with %s patterns and fallback category [%s]",
-                patterns.count(),
+                len(matcher),
                 fallback_category)
 
-    for code_archive_url in code_archive_urls:
-        logger.info("Checking status of %s", code_archive_url)
-        code_archive_url.check_status(patterns, fallback_category=fallback_category)
+    # Executor.map submits its whole input up front so rows are handed over one batch at a time to keep only
+    # BATCH_SIZE CodeArchiveUrls in memory
+    session = SESSION if max_workers <= MAX_WORKERS else create_session(pool_size=max_workers)
+    deadline = time.monotonic() + max_seconds if max_seconds is not None else None
+    throttle = HostThrottle()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while deadline is None or time.monotonic() < deadline:
+            batch = list(islice(code_archive_urls, BATCH_SIZE))
+            if not batch:
+                break
+            check_code_archive_urls(batch, executor, session, matcher, fallback_category, throttle)
+            logger.info("Verified URL status up to CodeArchiveUrl id %s", batch[-1].id)
+        else:
+            logger.warning("Stopped verifying URL status after %s seconds", max_seconds)
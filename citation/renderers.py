@@ -0,0 +1,20 @@
+import orjson
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson. Types orjson does not handle natively (lazy translation strings, Decimals,
+    querysets, ...) and dates and times, which DRF truncates to milliseconds, are converted the same way DRF's
+    JSONEncoder converts them. Indented (browsable API) responses are left to JSONRenderer
+    """
+    encoder_default = JSONEncoder().default
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(data, default=self.encoder_default, option=self.options)
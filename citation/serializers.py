@@ -1,21 +1,30 @@
+import copy
 import logging
 import time
-from collections import OrderedDict, defaultdict
-from hashlib import sha1
-from pprint import pformat
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter
 
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
 from django.core.mail import send_mail
+from django.db import transaction
 from django.db.models import Q
 from django.utils import timezone
+from django.utils.translation import get_language
 from rest_framework import serializers, pagination
 from rest_framework.exceptions import ValidationError
 from rest_framework.utils import model_meta
 
+from .graphviz.globals import CacheNames
 from .models import (Tag, Sponsor, Platform, Author, Publication, Container, ModelDocumentation, Note, AuditCommand,
                      AuditLog, PublicationModelDocumentations, PublicationPlatforms, PublicationSponsors,
                      CodeArchiveUrl, CodeArchiveUrlCategory, AuthorCorrespondenceLog)
+from .util import dumps, verify_timestamp_hash
 
 logger = logging.getLogger(__name__)
 
@@ -23,16 +32,31 @@ logger = logging.getLogger(__name__)
 class CatalogPagination(pagination.PageNumberPagination):
     # FIXME: review & refactor: http://www.django-rest-framework.org/api-guide/pagination/
     def get_paginated_response(self, data):
-        return OrderedDict([
-            ('start_index', self.page.start_index()),
-            ('end_index', self.page.end_index()),
-            ('num_pages', self.page.paginator.num_pages),
-            ('current_page', self.page.number),
-            ('count', self.page.paginator.count),
-            ('next', self.get_next_link()),
-            ('previous', self.get_previous_link()),
-            ('results', data)
-        ])
+        return {
+            'start_index': self.page.start_index(),
+            'end_index': self.page.end_index(),
+            'num_pages': self.page.paginator.num_pages,
+            'current_page': self.page.number,
+            'count': self.page.paginator.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+
+
+class CachedFieldsMixin:
+    """
+    Build a ModelSerializer's fields once per class instead of once per serializer instance. get_fields introspects
+    the model and instantiates every (nested) field, only the unbound copies returned here need to be fresh
+    """
+    _cached_fields = {}
+
+    def get_fields(self):
+        cls = type(self)
+        fields = CachedFieldsMixin._cached_fields.get(cls)
+        if fields is None:
+            fields = CachedFieldsMixin._cached_fields[cls] = super().get_fields()
+        return copy.deepcopy(fields)
 
 
 ###########################
@@ -64,6 +88,23 @@ class UserProfileSerializer(serializers.ModelSerializer):
         fields = ('id', 'first_name', 'last_name', 'username', 'email')
 
 
+def format_datetime(value, format='%m/%d/%Y %H:%M'):
+    # same output as a DateTimeField with the given format
+    if value is None:
+        return None
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.strftime(format)
+
+
+def note_representation(note):
+    return {'id': note.id, 'text': note.text, 'publication': note.publication_id,
+            'added_by': str(note.added_by), 'date_added': format_datetime(note.date_added),
+            'deleted_on': format_datetime(note.deleted_on),
+            'deleted_by': str(note.deleted_by) if note.deleted_by_id is not None else None,
+            'is_deleted': note.is_deleted}
+
+
 class NoteSerializer(serializers.ModelSerializer):
     added_by = serializers.StringRelatedField(read_only=True)
     date_added = serializers.DateTimeField(read_only=True, format='%m/%d/%Y %H:%M')
@@ -75,12 +116,26 @@ class NoteSerializer(serializers.ModelSerializer):
         model = Note
         fields = ('id', 'text', 'publication', 'added_by', 'date_added', 'deleted_on', 'deleted_by', 'is_deleted')
 
+    def to_representation(self, instance):
+        # rendered for every note of a publication, skip per field dispatch
+        return note_representation(instance)
+
+
+def auditlog_representation(auditlog):
+    # payload is already JSON compatible so it is returned as is
+    return {'id': auditlog.id, 'audit_command_id': auditlog.audit_command_id, 'action': auditlog.action,
+            'row_id': auditlog.row_id, 'table': auditlog.table, 'payload': auditlog.payload}
+
 
 class AuditLogSerializer(serializers.ModelSerializer):
     class Meta:
         model = AuditLog
         fields = read_only_fields = ('id', 'audit_command_id', 'action', 'row_id', 'table', 'payload')
 
+    def to_representation(self, instance):
+        # every field is read only and a plain attribute so skip per field dispatch
+        return auditlog_representation(instance)
+
 
 class AuditCommandSerializer(serializers.ModelSerializer):
     creator = serializers.StringRelatedField(read_only=True)
@@ -138,6 +193,20 @@ class ModelDocumentationSerializer(serializers.ModelSerializer):
         read_only_fields = ('id',)
 
 
+def get_model_documentation_json():
+    """
+    JSON list of every ModelDocumentation, kept in the shared cache so that every process sees it cleared by the
+    ModelDocumentation save and delete signal handlers in citation.signals. The timeout bounds how long writes that
+    bypass signals (clean_data, bulk get or create) can go unseen
+    """
+    model_documentation_json = cache.get(CacheNames.MODEL_DOCUMENTATION_LIST.value)
+    if model_documentation_json is None:
+        model_documentation_json = dumps(
+            ModelDocumentationSerializer(ModelDocumentation.objects.all(), many=True).data)
+        cache.set(CacheNames.MODEL_DOCUMENTATION_LIST.value, model_documentation_json, 86410)
+    return model_documentation_json
+
+
 class ContainerSerializer(serializers.ModelSerializer):
     class Meta:
         model = Container
@@ -151,76 +220,78 @@ class CreatorSerializer(serializers.ModelSerializer):
         read_only_fields = ('id',)
 
 
+@dataclass(slots=True)
 class PublicationAuditCommand:
-    def __init__(self, id, creator, action, auditlogs, date_added):
-        self.id = id
-        self.creator = creator
-        self.action = action
-        self.auditlogs = auditlogs
-        self.date_added = date_added
-
-    def __lt__(self, other):
-        return self.date_added > other.date_added
+    id: int
+    creator: str
+    action: str
+    auditlogs: list
+    date_added: datetime
+
+    def to_dict(self):
+        """
+        The activity log representation of this audit command, built directly instead of through ModelSerializers
+        since it is read only
+        """
+        return {
+            'id': self.id,
+            'creator': self.creator,
+            'action': self.action,
+            'auditlogs': [auditlog_representation(auditlog) for auditlog in self.auditlogs],
+            'date_added': format_datetime(self.date_added, '%Y/%m/%d %H:%M'),
+        }
 
     @staticmethod
     def partition_by_audit_command_id(auditlogs):
-        partioned_auditlogs = defaultdict(lambda: [])
+        partioned_auditlogs = defaultdict(list)
         for auditlog in auditlogs:
             partioned_auditlogs[auditlog.audit_command_id].append(auditlog)
         return partioned_auditlogs
 
     @classmethod
     def many_from_queryset(cls, auditlogs):
+        # fetch each auditlog's command and creator in the same query instead of a second in_bulk query, reading only
+        # the columns that are rendered
+        auditlogs = list(auditlogs.select_related('audit_command__creator').only(
+            'id', 'audit_command', 'action', 'row_id', 'table', 'payload', 'audit_command__action',
+            'audit_command__date_added', 'audit_command__creator', 'audit_command__creator__username'))
         partioned_auditlogs = cls.partition_by_audit_command_id(auditlogs)
-        audit_command_ids = partioned_auditlogs.keys()
-        in_bulk_audit_commands = AuditCommand.objects.select_related('creator').in_bulk(audit_command_ids)
+        audit_commands = {auditlog.audit_command_id: auditlog.audit_command for auditlog in auditlogs}
 
         publications_audit_commands = []
-        for id, audit_command in in_bulk_audit_commands.items():
+        for id, audit_command in audit_commands.items():
             auditlogs = partioned_auditlogs[id]
-            publication_audit_command = cls(id=id, creator=audit_command.creator.username,
-                                            action=audit_command.action, auditlogs=auditlogs,
-                                            date_added=audit_command.date_added)
+            publication_audit_command = cls(id, audit_command.creator.username, audit_command.action, auditlogs,
+                                            audit_command.date_added)
             publications_audit_commands.append(publication_audit_command)
 
-        publications_audit_commands.sort()
+        # newest first
+        publications_audit_commands.sort(key=attrgetter('date_added'), reverse=True)
         return publications_audit_commands
 
 
 def publication_audit_command_serializer(auditlogs):
-    partioned_auditlogs = defaultdict(lambda: [])
-    for auditlog in auditlogs:
-        partioned_auditlogs[auditlog.audit_command_id].append(auditlog)
+    partioned_auditlogs = PublicationAuditCommand.partition_by_audit_command_id(auditlogs)
 
-    audit_command_ids = partioned_auditlogs.keys()
-    in_bulk_audit_commands = AuditCommand.objects.select_related('creator').in_bulk(audit_command_ids)
+    audit_commands = AuditCommand.objects.filter(id__in=partioned_auditlogs.keys()) \
+        .values_list('id', 'creator__username', 'action', 'date_added')
 
     publications_audit_commands = []
-    for id, audit_command in in_bulk_audit_commands.items():
-        auditlogs = partioned_auditlogs[id]
-        publication_audit_command = dict(id=id, creator=audit_command.creator.username,
-                                         action=audit_command.action, auditlogs=auditlogs,
-                                         date_added=audit_command.date_added)
+    for id, creator, action, date_added in audit_commands:
+        publication_audit_command = dict(id=id, creator=creator, action=action, auditlogs=partioned_auditlogs[id],
+                                         date_added=date_added)
         publications_audit_commands.append(publication_audit_command)
 
     return publications_audit_commands
 
 
-class PublicationAuditCommandSerializer(serializers.Serializer):
-    id = serializers.IntegerField(read_only=True)
-    creator = serializers.CharField(read_only=True)
-    action = serializers.CharField(read_only=True)
-    auditlogs = AuditLogSerializer(many=True)
-    date_added = serializers.DateTimeField(read_only=True, format='%Y/%m/%d %H:%M')
-
-
 class AuditCommandContibutionSerializer(serializers.Serializer):
     creator = serializers.StringRelatedField(read_only=True)
     contribution = serializers.FloatField(read_only=True)
     date_added = serializers.DateTimeField(read_only=True, format='%m/%d/%Y %H:%M')
 
 
-class PublicationListSerializer(serializers.ModelSerializer):
+class PublicationListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     detail_url = serializers.CharField(source='get_absolute_url', read_only=True)
     date_modified = serializers.DateTimeField(read_only=True, format='%m/%d/%Y %H:%M')
     apa_citation_string = serializers.ReadOnlyField()
@@ -233,7 +304,7 @@ class PublicationListSerializer(serializers.ModelSerializer):
         )
 
 
-class CodeArchiveUrlSerializer(serializers.ModelSerializer):
+class CodeArchiveUrlSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     id = serializers.ModelField(model_field=CodeArchiveUrl()._meta.get_field('id'), allow_null=True)
     creator = serializers.PrimaryKeyRelatedField(allow_null=True, queryset=User.objects.all())
     publication = serializers.PrimaryKeyRelatedField(allow_null=True, queryset=Publication.api.primary(),
@@ -246,8 +317,27 @@ class CodeArchiveUrlSerializer(serializers.ModelSerializer):
             'id', 'category', 'category_name', 'system_overridable_category', 'url', 'status', 'creator', 'publication'
         )
 
+    def to_representation(self, instance):
+        # rendered for every code archive url of a publication, skip per field dispatch
+        return {'id': instance.id, 'category': instance.category_id, 'category_name': instance.category_name,
+                'system_overridable_category': instance.system_overridable_category, 'url': instance.url,
+                'status': instance.status, 'creator': instance.creator_id, 'publication': instance.publication_id}
 
-class PublicationSerializer(serializers.ModelSerializer):
+
+# the status choices are fixed so their options are built once per process, per language since the labels are
+# translated to the active language
+
+@lru_cache(maxsize=None)
+def code_archive_status_options(language):
+    return [{'value': choice[0], 'label': str(choice[1])} for choice in CodeArchiveUrl.STATUS]
+
+
+@lru_cache(maxsize=None)
+def status_options(language):
+    return {choice[0]: str(choice[1]) for choice in Publication.Status}
+
+
+class PublicationSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializes publication querysets.
     """
@@ -268,6 +358,8 @@ class PublicationSerializer(serializers.ModelSerializer):
     code_archive_status_options = serializers.SerializerMethodField()
     apa_citation_string = serializers.ReadOnlyField()
     flagged = serializers.BooleanField()
+    # year_published was a string property before it was stored as an integer, keep the API returning a string
+    year_published = serializers.CharField(read_only=True)
 
     """
     XXX: copy-pasted from default ModelSerializer code but omitting the raise_errors_on_nested_writes. Revisit at some
@@ -283,73 +375,94 @@ class PublicationSerializer(serializers.ModelSerializer):
             .filter(Q(table=obj._meta.model_name, row_id=obj.id) |
                     Q(payload__data__publication_id=obj.id))
         pacs = PublicationAuditCommand.many_from_queryset(audit_logs)
-        serialized_pacs = [PublicationAuditCommandSerializer(pac).data for pac in pacs]
-        return serialized_pacs
+        return [pac.to_dict() for pac in pacs]
+
+    # the category options are the same for every publication so they are built once per serializer context, i.e.
+    # once per request
 
     def get_code_archive_category_options(self, obj):
-        return [{'value': choice.id,
-                 'label': f'{choice.category} / {choice.subcategory}' if choice.subcategory else choice.category}
-                for choice in CodeArchiveUrlCategory.objects.all()]
+        options = self.context.get('code_archive_category_options')
+        if options is None:
+            options = self.context['code_archive_category_options'] = [
+                {'value': id, 'label': f'{category} / {subcategory}' if subcategory else category}
+                for id, category, subcategory in CodeArchiveUrlCategory.objects.values_list(
+                    'id', 'category', 'subcategory')]
+        return options
 
     def get_code_archive_status_options(self, obj):
-        return [{'value': choice[0], 'label': str(choice[1])} for choice in CodeArchiveUrl.STATUS]
+        return code_archive_status_options(get_language())
 
     def get_status_options(self, obj):
-        return {choice[0]: str(choice[1]) for choice in Publication.Status}
+        return status_options(get_language())
+
+    @staticmethod
+    def save_named_relations(audit_command, publication, names, model, through_model, related_field,
+                             create_missing=True, auditlog_buffer=None):
+        """
+        Link publication to the model instances with the given names, and unlink all others, with a constant number
+        of queries. Only missing instances and links are passed to log_get_or_create since existing ones would not
+        produce an auditlog
+        """
+        names = set(names)
+        instances = model.objects.in_bulk(names, field_name='name')
+        missing_names = names.difference(instances)
+        if missing_names:
+            if not create_missing:
+                raise model.DoesNotExist('{} {} do not exist'.format(model._meta.verbose_name_plural,
+                                                                     sorted(missing_names)))
+            created = model.objects.bulk_log_get_or_create(
+                audit_command=audit_command,
+                rows=[{'publication': publication, 'name': name} for name in sorted(missing_names)],
+                auditlog_buffer=auditlog_buffer)
+            instances.update((instance.name, instance) for instance, _ in created)
+
+        related_id_field = '{}_id'.format(related_field)
+        ids = {instance.id for instance in instances.values()}
+        links = through_model.objects.filter(publication=publication)
+        linked_ids = set(links.values_list(related_id_field, flat=True))
+        through_model.objects.bulk_log_get_or_create(
+            audit_command=audit_command,
+            rows=[{'publication': publication, 'publication_id': publication.id, related_id_field: related_id}
+                  for related_id in sorted(ids.difference(linked_ids))],
+            auditlog_buffer=auditlog_buffer)
+        links.exclude(**{'{}__in'.format(related_id_field): ids}).log_delete(audit_command=audit_command,
+                                                                            auditlog_buffer=auditlog_buffer)
 
     @staticmethod
-    def save_model_documentation(audit_command, publication, raw_model_documentations):
+    def save_model_documentation(audit_command, publication, raw_model_documentations, auditlog_buffer=None):
         names = [model_documentation_raw['name'] for model_documentation_raw in raw_model_documentations]
-        for name in names:
-            model_documentation = ModelDocumentation.objects.get(name=name)
-            PublicationModelDocumentations.objects.log_get_or_create(audit_command=audit_command,
-                                                                     publication=publication,
-                                                                     publication_id=publication.id,
-                                                                     model_documentation_id=model_documentation.id)
-        PublicationModelDocumentations.objects \
-            .exclude(model_documentation__in=ModelDocumentation.objects.filter(name__in=names)) \
-            .filter(publication=publication) \
-            .log_delete(audit_command=audit_command)
+        PublicationSerializer.save_named_relations(audit_command, publication, names, ModelDocumentation,
+                                                   PublicationModelDocumentations, 'model_documentation',
+                                                   create_missing=False, auditlog_buffer=auditlog_buffer)
 
     @staticmethod
-    def save_platform(audit_command, publication, raw_platforms):
+    def save_platform(audit_command, publication, raw_platforms, auditlog_buffer=None):
         names = [raw_platform['name'] for raw_platform in raw_platforms]
-        for name in names:
-            platform, created = Platform.objects.log_get_or_create(audit_command=audit_command, publication=publication,
-                                                                   name=name)
-            PublicationPlatforms.objects.log_get_or_create(audit_command=audit_command,
-                                                           publication=publication,
-                                                           publication_id=publication.id,
-                                                           platform_id=platform.id)
-        PublicationPlatforms.objects \
-            .exclude(platform__in=Platform.objects.filter(name__in=names)) \
-            .filter(publication=publication) \
-            .log_delete(audit_command=audit_command)
+        PublicationSerializer.save_named_relations(audit_command, publication, names, Platform, PublicationPlatforms,
+                                                   'platform', auditlog_buffer=auditlog_buffer)
 
     @staticmethod
-    def save_sponsor(audit_command, publication, raw_sponsors):
+    def save_sponsor(audit_command, publication, raw_sponsors, auditlog_buffer=None):
         names = [raw_sponsor['name'] for raw_sponsor in raw_sponsors]
-        for name in names:
-            platform, created = Sponsor.objects.log_get_or_create(audit_command=audit_command, publication=publication,
-                                                                  name=name)
-            PublicationSponsors.objects.log_get_or_create(audit_command=audit_command,
-                                                          publication=publication,
-                                                          publication_id=publication.id,
-                                                          sponsor_id=platform.id)
-        PublicationSponsors.objects \
-            .exclude(sponsor__in=Sponsor.objects.filter(name__in=names)) \
-            .filter(publication=publication) \
-            .log_delete(audit_command=audit_command)
+        PublicationSerializer.save_named_relations(audit_command, publication, names, Sponsor, PublicationSponsors,
+                                                   'sponsor', auditlog_buffer=auditlog_buffer)
 
     @staticmethod
-    def save_code_archive_url(audit_command, publication, raw_code_archive_urls):
+    def save_code_archive_url(audit_command, publication, raw_code_archive_urls, auditlog_buffer=None):
         code_archive_urls = []
+        # fetch the existing urls together, with the category their auditlog payload compares against
+        pks = [raw_code_archive_url['id'] for raw_code_archive_url in raw_code_archive_urls
+               if raw_code_archive_url.get('id') is not None]
+        existing = CodeArchiveUrl.objects.select_related('category').in_bulk(pks)
         for raw_code_archive_url in raw_code_archive_urls:
-            logger.info(pformat(raw_code_archive_url))
+            logger.debug("Saving code archive url %r", raw_code_archive_url)
             pk = raw_code_archive_url.get('id')
             if pk is not None:
-                code_archive_url = CodeArchiveUrl.objects.get(pk=pk)
+                code_archive_url = existing.get(pk)
+                if code_archive_url is None:
+                    raise CodeArchiveUrl.DoesNotExist('CodeArchiveUrl matching id={} does not exist'.format(pk))
                 code_archive_url.log_update(audit_command=audit_command,
+                                            auditlog_buffer=auditlog_buffer,
                                             system_overridable_category=raw_code_archive_url[
                                                 'system_overridable_category'],
                                             category=raw_code_archive_url['category'],
@@ -357,6 +470,7 @@ class PublicationSerializer(serializers.ModelSerializer):
                                             url=raw_code_archive_url['url'])
             else:
                 code_archive_url = CodeArchiveUrl.objects.log_create(audit_command=audit_command,
+                                                                     auditlog_buffer=auditlog_buffer,
                                                                      creator=audit_command.creator,
                                                                      publication=publication,
                                                                      publication_id=publication.id,
@@ -370,22 +484,36 @@ class PublicationSerializer(serializers.ModelSerializer):
         CodeArchiveUrl.objects \
             .exclude(id__in=code_archive_urls) \
             .filter(publication=publication) \
-            .log_delete(audit_command=audit_command)
+            .log_delete(audit_command=audit_command, auditlog_buffer=auditlog_buffer)
 
     @classmethod
     def save_related(cls, audit_command, publication, validated_data):
-        cls.save_model_documentation(audit_command=audit_command,
-                                     publication=publication,
-                                     raw_model_documentations=validated_data['model_documentation'])
-        cls.save_platform(audit_command=audit_command,
-                          publication=publication,
-                          raw_platforms=validated_data['platforms'])
-        cls.save_sponsor(audit_command=audit_command,
-                         publication=publication,
-                         raw_sponsors=validated_data['sponsors'])
-        cls.save_code_archive_url(audit_command=audit_command,
-                                  publication=publication,
-                                  raw_code_archive_urls=validated_data['code_archive_urls'])
+        # one transaction for all related tables with their auditlogs inserted together at the end
+        auditlog_buffer = []
+        with transaction.atomic():
+            cls.save_model_documentation(audit_command=audit_command,
+                                         publication=publication,
+                                         raw_model_documentations=validated_data.pop('model_documentation'),
+                                         auditlog_buffer=auditlog_buffer)
+            cls.save_platform(audit_command=audit_command,
+                              publication=publication,
+                              raw_platforms=validated_data.pop('platforms'),
+                              auditlog_buffer=auditlog_buffer)
+            cls.save_sponsor(audit_command=audit_command,
+                             publication=publication,
+                             raw_sponsors=validated_data.pop('sponsors'),
+                             auditlog_buffer=auditlog_buffer)
+            cls.save_code_archive_url(audit_command=audit_command,
+                                      publication=publication,
+                                      raw_code_archive_urls=validated_data.pop('code_archive_urls'),
+                                      auditlog_buffer=auditlog_buffer)
+            AuditLog.objects.bulk_create(auditlog_buffer, batch_size=1000)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def get_field_info(cls):
+        # the model's fields do not change while the process runs
+        return model_meta.get_field_info(cls.Meta.model)
 
     def create(self, audit_command, validated_data):
         ModelClass = self.Meta.model
@@ -393,7 +521,7 @@ class PublicationSerializer(serializers.ModelSerializer):
         # Remove many-to-many relationships from validated_data.
         # They are not valid arguments to the default `.create()` method,
         # as they require that the instance has already been saved.
-        info = model_meta.get_field_info(ModelClass)
+        info = self.get_field_info()
         many_to_many = {}
         for field_name, relation_info in info.relations.items():
             if relation_info.to_many and (field_name in validated_data):
@@ -411,28 +539,26 @@ class PublicationSerializer(serializers.ModelSerializer):
     def update(self, audit_command, instance, validated_data):
         concrete_changes = {}
 
-        raw_model_documentations = validated_data.pop('model_documentation')
-        self.save_model_documentation(audit_command=audit_command, publication=instance,
-                                      raw_model_documentations=raw_model_documentations)
-
-        raw_platforms = validated_data.pop('platforms')
-        self.save_platform(audit_command=audit_command, publication=instance, raw_platforms=raw_platforms)
-
-        raw_sponsors = validated_data.pop('sponsors')
-        self.save_sponsor(audit_command=audit_command, publication=instance, raw_sponsors=raw_sponsors)
-
-        raw_code_archive_urls = validated_data.pop('code_archive_urls')
-        self.save_code_archive_url(audit_command=audit_command, publication=instance,
-                                   raw_code_archive_urls=raw_code_archive_urls)
+        self.save_related(audit_command=audit_command, publication=instance, validated_data=validated_data)
 
         for field_name, updated_data_value in validated_data.items():
             try:
-                current_data_value = getattr(instance, field_name)
-            except AttributeError:
-                raise ValidationError("'{0}' not a field of publication with id={1} and title={2}".format(
-                    field_name, instance.id, instance.title))
-
-            if updated_data_value != current_data_value:
+                field = instance._meta.get_field(field_name)
+            except FieldDoesNotExist:
+                field = None
+            if field is not None and field.many_to_one:
+                # compare foreign keys by id, reading the related instance would cost a query per foreign key
+                current_data_value = getattr(instance, field.attname)
+                compared_value = updated_data_value.pk if updated_data_value is not None else None
+            else:
+                try:
+                    current_data_value = getattr(instance, field_name)
+                except AttributeError:
+                    raise ValidationError("'{0}' not a field of publication with id={1} and title={2}".format(
+                        field_name, instance.id, instance.title))
+                compared_value = updated_data_value
+
+            if compared_value != current_data_value:
                 concrete_changes[field_name] = updated_data_value
 
         if concrete_changes:
@@ -547,9 +673,7 @@ class ContactFormSerializer(serializers.Serializer):
         security_hash = data['security_hash']
         timestamp = str(data['timestamp'])
 
-        info = (timestamp, settings.SECRET_KEY)
-        new_security_hash = sha1("".join(info).encode("ascii")).hexdigest()
-        if security_hash == new_security_hash:
+        if verify_timestamp_hash(timestamp, security_hash):
             return data
         logger.warn("timestamp was altered, flagging as invalid")
         raise serializers.ValidationError("timestamp was tampered.")
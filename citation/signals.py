@@ -1,8 +1,21 @@
 import logging
 
-from citation.models import Publication, ModelDocumentation, PublicationModelDocumentations, AuditCommand
-from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from citation.graphviz.globals import CacheNames
+from citation.models import CodeArchiveUrlCategory, CodeArchiveUrlPattern, ModelDocumentation, \
+    get_code_archive_url_matcher
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
 logger = logging.getLogger(__name__)
+
+
+@receiver([post_save, post_delete], sender=CodeArchiveUrlPattern)
+@receiver([post_save, post_delete], sender=CodeArchiveUrlCategory)
+def clear_code_archive_url_matcher(sender, **kwargs):
+    get_code_archive_url_matcher.cache_clear()
+
+
+@receiver([post_save, post_delete], sender=ModelDocumentation)
+def clear_model_documentation_json(sender, **kwargs):
+    cache.delete(CacheNames.MODEL_DOCUMENTATION_LIST.value)
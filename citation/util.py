@@ -1,10 +1,16 @@
+import hmac
 import logging
 import re
-from hashlib import sha1
+import threading
+from functools import lru_cache
+from hashlib import blake2b
 from typing import Tuple
 
 import bleach
+import bleach.linkifier
+import bleach.sanitizer
 import markdown
+import orjson
 from django.conf import settings
 from django.core.mail import EmailMultiAlternatives
 from django.db.models.aggregates import Aggregate
@@ -14,6 +20,12 @@ from unidecode import unidecode
 
 logger = logging.getLogger(__name__)
 
+# compiled once since the sanitizers below run for every author and reference of an import
+DOI_EXCLUDED_CHARACTERS_REGEX = re.compile(r"\{|\}|\\")
+BIBTEX_QUOTE_REGEX = re.compile(r"\{''\}|``")
+# newlines become spaces and punctuation is dropped from names in a single str.translate pass
+NAME_TRANSLATION_TABLE = str.maketrans({'\n': ' ', '\r': ' ', '.': None, ',': None, '{': None, '}': None})
+NAME_SEPARATOR_REGEX = re.compile(r"\b,? +\b")
 
 ALLOWED_TAGS = bleach.ALLOWED_TAGS + [
     'p', 'h1', 'h2', 'h3', 'h4', 'pre', 'br', 'hr', 'div', 'span', 'footer',
@@ -34,18 +46,32 @@ DEFAULT_MARKDOWN_EXTENSIONS = [
 ]
 
 
+# Markdown instances and bleach Linkers and Cleaners are expensive to construct but not thread safe, so one of each is
+# kept per thread
+_html_renderers = threading.local()
+
+
 def render_sanitized_markdown(md_text: str, extensions=None):
     if extensions is None:
-        extensions = DEFAULT_MARKDOWN_EXTENSIONS
-    html = markdown.markdown(
-        md_text,
-        extensions=extensions
-    )
+        md = getattr(_html_renderers, 'markdown', None)
+        if md is None:
+            md = _html_renderers.markdown = markdown.Markdown(extensions=DEFAULT_MARKDOWN_EXTENSIONS)
+        # reset clears the state the toc and footnote extensions keep from the previous document
+        html = md.reset().convert(md_text)
+    else:
+        html = markdown.markdown(
+            md_text,
+            extensions=extensions
+        )
     return sanitize_html(html)
 
 
 def sanitize_html(html: str):
-    return bleach.clean(bleach.linkify(html), tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES)
+    linker = getattr(_html_renderers, 'linker', None)
+    if linker is None:
+        linker = _html_renderers.linker = bleach.linkifier.Linker()
+        _html_renderers.cleaner = bleach.sanitizer.Cleaner(tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES)
+    return _html_renderers.cleaner.clean(linker.linkify(html))
 
 
 def create_markdown_email(subject: str=None, to=None, template_name: str=None, context: dict=None, body: str=None, from_email: str=settings.DEFAULT_FROM_EMAIL,
@@ -74,27 +100,37 @@ def send_markdown_email(**kwargs):
     create_markdown_email(**kwargs).send()
 
 
+def dumps(obj) -> str:
+    """
+    compact JSON string for the views to embed in their responses. default=str covers the lazy translation strings
+    that can appear in serializer output
+    """
+    return orjson.dumps(obj, default=str).decode()
+
+
 def sanitize_doi(s):
     if s:
-        s = re.sub(r"\{|\}|\\", "", s)
+        s = DOI_EXCLUDED_CHARACTERS_REGEX.sub("", s)
         s = s.lower()
     return s
 
 
 def sanitize_name(s):
     if s:
-        s = re.sub("\{''\}|``", "\"", s)
-        s = re.sub("\n", " ", s)
-        s = re.sub("\\\\", "", s)
+        s = BIBTEX_QUOTE_REGEX.sub("\"", s)
+        s = s.replace("\n", " ").replace("\\", "")
     return s
 
 
+# the same author names recur throughout a bibliography
+@lru_cache(maxsize=8192)
 def normalize_name(name: str, strip_unicode=True) -> str:
-    normalized_name = name.upper()
-    normalized_name = re.sub(r"\n|\r", " ", normalized_name)
-    normalized_name = re.sub(r"\.|,|\{|\}", "", normalized_name)
+    normalized_name = name.upper().translate(NAME_TRANSLATION_TABLE)
     if strip_unicode:
-        normalized_name = unidecode(normalized_name).strip()
+        # most names are already ascii and unidecode walks its transliteration tables per character
+        if not normalized_name.isascii():
+            normalized_name = unidecode(normalized_name)
+        normalized_name = normalized_name.strip()
     else:
         normalized_name = normalized_name.strip()
     return normalized_name
@@ -107,7 +143,7 @@ def all_initials(given_names):
 
 def last_name_and_initials(name: str) -> Tuple[str, str]:
     normalized_name = normalize_name(name)
-    name_split = re.split(r"\b,? +\b", normalized_name)
+    name_split = NAME_SEPARATOR_REGEX.split(normalized_name)
     family = name_split[0]
     given_names = name_split[1:] if len(name_split) > 1 else []
     if all_initials(given_names):
@@ -124,7 +160,7 @@ def last_name_and_initials(name: str) -> Tuple[str, str]:
 
 
 def last_name_and_initial(normalized_name: str) -> str:
-    name_split = re.split(r"\b,? +\b", normalized_name)
+    name_split = NAME_SEPARATOR_REGEX.split(normalized_name)
     family = name_split[0]
     given_names = name_split[1:] if len(name_split) > 1 else []
     if all_initials(given_names):
@@ -162,5 +198,10 @@ class ArrayAgg(Aggregate):
 
 
 def create_timestamp_hash(timestamp: float):
-    info = (str(timestamp), settings.SECRET_KEY)
-    return sha1("".join(info).encode("ascii")).hexdigest()
\ No newline at end of file
+    return hmac.new(settings.SECRET_KEY.encode('utf-8'), str(timestamp).encode('utf-8'), blake2b).hexdigest()
+
+
+def verify_timestamp_hash(timestamp: float, security_hash: str) -> bool:
+    """constant time comparison of security_hash against the hash of timestamp"""
+    # compare bytes, compare_digest raises a TypeError for str arguments with non-ASCII characters
+    return hmac.compare_digest(security_hash.encode('utf-8'), create_timestamp_hash(timestamp).encode('utf-8'))
\ No newline at end of file
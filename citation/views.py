@@ -1,8 +1,7 @@
 import logging
 from datetime import datetime
-from json import dumps
 
-from .util import send_markdown_email
+from .util import dumps, send_markdown_email
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
@@ -12,11 +11,14 @@ from rest_framework import status, renderers, generics, views
 from rest_framework.response import Response
 
 from .models import Publication, ModelDocumentation, Note, AuthorCorrespondenceLog
-from .serializers import (CatalogPagination, ModelDocumentationSerializer, NoteSerializer,
+from .renderers import ORJSONRenderer
+from .serializers import (CatalogPagination, NoteSerializer, get_model_documentation_json,
                           PublicationSerializer, PublicationListSerializer, AuthorCorrespondenceLogSerializer)
 
 logger = logging.getLogger(__name__)
 
+MODEL_DOCUMENTATION_CATEGORIES_JSON = dumps(ModelDocumentation.CATEGORIES)
+
 
 class AuthorUpdateView(views.APIView):
 
@@ -60,17 +62,21 @@ class PublicationList(LoginRequiredMixin, generics.GenericAPIView):
     """
     List all publications, or create a new publication
     """
-    renderer_classes = (renderers.TemplateHTMLRenderer, renderers.JSONRenderer)
+    renderer_classes = (renderers.TemplateHTMLRenderer, ORJSONRenderer)
     # FIXME: look into properly implementing pagination via django rest framework
     pagination_class = CatalogPagination
 
     def get(self, request, format=None):
-        publication_list = Publication.objects.all()
+        publication_list = Publication.api.for_list()
         paginator = CatalogPagination()
         result_page = paginator.paginate_queryset(publication_list, request)
         serializer = PublicationListSerializer(result_page, many=True)
         response = paginator.get_paginated_response(serializer.data)
-        return Response({'json': dumps(response)}, template_name="publication/list.html")
+        if request.accepted_renderer.format == 'html':
+            # the template embeds the page in a script as a JSON string
+            return Response({'json': dumps(response)}, template_name="publication/list.html")
+        # the JSON renderer encodes the page itself, dumping it here would encode it twice
+        return Response(response)
 
     def post(self, request, format=None):
         # adding current user to added_by field
@@ -87,23 +93,26 @@ class CuratorPublicationDetail(LoginRequiredMixin, generics.GenericAPIView):
     """
     Retrieve, update or delete a publication instance.
     """
-    renderer_classes = (renderers.TemplateHTMLRenderer, renderers.JSONRenderer)
+    renderer_classes = (renderers.TemplateHTMLRenderer, ORJSONRenderer)
 
     def get_object(self, pk):
-        return get_object_or_404(Publication, pk=pk)
+        # the many to many relations are not prefetched here since put renders them after saving changes to them
+        return get_object_or_404(Publication.objects.select_related('container', 'assigned_curator'), pk=pk)
 
     def get(self, request, pk, slug=None, format=None):
-        publication = self.get_object(pk)
+        publication = get_object_or_404(Publication.api.for_detail(), pk=pk)
         obj_url = publication.get_absolute_url()
 
         if self.request.path != obj_url:
             return HttpResponseRedirect(obj_url)
 
         serializer = PublicationSerializer(publication)
-        model_documentation_serializer = ModelDocumentationSerializer(ModelDocumentation.objects.all(), many=True)
+        if request.accepted_renderer.format != 'html':
+            # the JSON renderer encodes the publication itself, the template context below is only used for html
+            return Response(serializer.data)
         return Response({'json': dumps(serializer.data), 'pk': pk,
-                         'model_documentation_categories_json': dumps(ModelDocumentation.CATEGORIES),
-                         'model_documentation_list_json': dumps(model_documentation_serializer.data)},
+                         'model_documentation_categories_json': MODEL_DOCUMENTATION_CATEGORIES_JSON,
+                         'model_documentation_list_json': get_model_documentation_json()},
                         template_name='workflow/curator_publication_detail.html')
 
     def put(self, request, pk, slug=None):
@@ -112,22 +121,23 @@ class CuratorPublicationDetail(LoginRequiredMixin, generics.GenericAPIView):
         # computational models.
         serializer = PublicationSerializer(publication, data=request.data)
         if serializer.is_valid():
-            self.update_contribution_data(pk)
             serializer.save(user=request.user)
+            self.update_contribution_data(serializer.instance)
             return Response(serializer.data)
         logger.warning("serializer failed validation: %s", serializer.errors)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     @staticmethod
-    def update_contribution_data(pk):
-        Publication.objects.get(pk=pk).contributor_data()
+    def update_contribution_data(publication):
+        # refresh the cached contributor data now that this edit's auditlogs have been written
+        publication.contributor_data(latest=True)
 
 
 class NoteDetail(LoginRequiredMixin, generics.GenericAPIView):
     """
     Retrieve, update or delete a note instance.
     """
-    renderer_classes = (renderers.JSONRenderer,)
+    renderer_classes = (ORJSONRenderer,)
 
     def get_object(self, pk):
         return get_object_or_404(Note, pk=pk)
@@ -159,13 +169,20 @@ class NoteList(LoginRequiredMixin, generics.GenericAPIView):
     """
     Get all the notes or create a note
     """
-    renderer_classes = (renderers.JSONRenderer,)
+    renderer_classes = (ORJSONRenderer,)
     serializer_class = NoteSerializer
+    pagination_class = CatalogPagination
 
     def get(self, request, format=None):
-        note = Note.objects.all()
-        serializer = NoteSerializer(note, many=True)
-        return Response({'json': dumps(serializer.data)})
+        # the users are rendered by name for every note
+        notes = Note.objects.select_related('added_by', 'deleted_by') \
+            .only('id', 'text', 'publication', 'date_added', 'deleted_on', 'added_by', 'added_by__username',
+                  'deleted_by', 'deleted_by__username') \
+            .order_by('id')
+        paginator = CatalogPagination()
+        result_page = paginator.paginate_queryset(notes, request)
+        serializer = NoteSerializer(result_page, many=True)
+        return Response(paginator.get_paginated_response(serializer.data))
 
     def post(self, request):
         # adding current user to added_by field
@@ -26,6 +26,7 @@ setup(name='citation',
           'fuzzywuzzy',
           'lxml',
           'markdown',
+          'orjson>=3.10',
           'bibtexparser',
           'pyzotero',
           'django-extensions',
@@ -100,6 +100,10 @@ MIDDLEWARE = (
 # DJANGO REST Framework's Pagination settings
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_RENDERER_CLASSES': (
+        'citation.renderers.ORJSONRenderer',
+        'rest_framework.renderers.TemplateHTMLRenderer',
+    ),
     'PAGE_SIZE': 15
 }
 
@@ -51,6 +51,39 @@ class TestModelManagers(TestCase):
         auditlog2 = models.AuditLog.objects.filter(action='UPDATE').first()
         self.assertEqual(auditlog2, None)
 
+    def test_author_bulk_log_get_or_create(self):
+        existing_author = models.Author.objects.create(**self.author_detached)
+        new_author_detached = {'orcid': '5678', 'type': 'foo', 'given_name': 'Alice', 'family_name': 'Jones'}
+        results = models.Author.objects.bulk_log_get_or_create(
+            audit_command=self.context, rows=[self.author_detached, new_author_detached])
+        self.assertEqual([created for author, created in results], [False, True])
+        self.assertEqual(results[0][0], existing_author)
+        auditlogs = models.AuditLog.objects.filter(table='author')
+        self.assertEqual(auditlogs.count(), 1)
+        self.assertEqual(auditlogs[0].action, 'INSERT')
+        self.assertEqual(auditlogs[0].row_id, results[1][0].id)
+
+    def test_platform_log_get_or_create_by_unique_name(self):
+        platform, created = models.Platform.objects.log_get_or_create(audit_command=self.context, name='NetLogo')
+        self.assertTrue(created)
+        self.assertEqual(models.Platform.objects.get(name='NetLogo').id, platform.id)
+        same_platform, created = models.Platform.objects.log_get_or_create(audit_command=self.context, name='NetLogo')
+        self.assertFalse(created)
+        self.assertEqual(same_platform.id, platform.id)
+        self.assertEqual(models.AuditLog.objects.filter(table='platform', action='INSERT').count(), 1)
+
+    def test_through_model_bulk_log_get_or_create_by_unique_together(self):
+        publication = self.publication[0]
+        platform = models.Platform.objects.create(name='NetLogo')
+        row = {'publication': publication, 'publication_id': publication.id, 'platform_id': platform.id}
+        [(link, created)] = models.PublicationPlatforms.objects.bulk_log_get_or_create(audit_command=self.context,
+                                                                                       rows=[dict(row)])
+        self.assertTrue(created)
+        [(same_link, created)] = models.PublicationPlatforms.objects.bulk_log_get_or_create(
+            audit_command=self.context, rows=[dict(row)])
+        self.assertFalse(created)
+        self.assertEqual(same_link.id, link.id)
+
     def test_author_log_update(self):
         models.Author.objects.create(**self.author_detached)
         models.Author.objects.log_update(audit_command=self.context, given_name='Ralph')
@@ -70,6 +103,14 @@ class TestModelManagers(TestCase):
         # auditlog.payload.pop('name')
         self.assertEqual(auditlog.payload['data']['given_name'], self.author_detached['given_name'])
 
+    def test_auditlog_buffer_defers_inserts(self):
+        auditlog_buffer = []
+        author = models.Author.objects.log_create(audit_command=self.context, auditlog_buffer=auditlog_buffer,
+                                                  **self.author_detached)
+        author.log_update(audit_command=self.context, auditlog_buffer=auditlog_buffer, given_name='Ralph')
+        self.assertFalse(models.AuditLog.objects.filter(table='author').exists())
+        self.assertEqual([auditlog.action for auditlog in auditlog_buffer], ['INSERT', 'UPDATE'])
+
     def test_audit_log_contribution(self):
         models.AuditLog.objects.create(row_id='1', table='publication', audit_command=self.context)
         models.AuditLog.objects.create(row_id='1', table='publication', audit_command=self.second_context)
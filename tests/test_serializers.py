@@ -5,11 +5,11 @@ from unittest.mock import patch
 
 from rest_framework import serializers
 
-from citation.models import AuditCommand, AuditLog, Container, Publication, PublicationPlatforms, Platform, \
+from citation.models import AuditCommand, AuditLog, Container, Note, Publication, PublicationPlatforms, Platform, \
     Author, \
     PublicationAuthors
-from citation.serializers import PublicationSerializer, ContactFormSerializer
-from citation.util import create_timestamp_hash
+from citation.serializers import PublicationSerializer, ContactFormSerializer, format_datetime
+from citation.util import create_timestamp_hash, verify_timestamp_hash
 
 from .common import BaseTest
 
@@ -61,6 +61,22 @@ class PublicationSerializerTest(BaseTest):
         self.assertEqual(AuditLog.objects.filter(table='platform').count(), 1)
         self.assertEqual(AuditCommand.objects.count(), initial_audit_command_count + 3)
 
+    def test_fields_are_not_shared_between_instances(self):
+        first = PublicationSerializer(self.publication)
+        second = PublicationSerializer(self.publication)
+        self.assertEqual(list(first.fields), list(second.fields))
+        self.assertIsNot(first.fields['code_archive_urls'], second.fields['code_archive_urls'])
+        self.assertIs(first.fields['code_archive_urls'].parent, first)
+        self.assertEqual(first.data, second.data)
+
+    def test_notes_representation(self):
+        note = Note.objects.create(text='Check the archive', added_by=self.user, publication=self.publication)
+        publication = Publication.api.for_detail().get(pk=self.publication.pk)
+        notes = PublicationSerializer(publication).data['notes']
+        self.assertEqual(notes, [{'id': note.id, 'text': 'Check the archive', 'publication': self.publication.id,
+                                  'added_by': 'bobsmith', 'date_added': format_datetime(note.date_added),
+                                  'deleted_on': None, 'deleted_by': None, 'is_deleted': False}])
+
 
 class ContactFormSerializerTestCase(BaseTest):
     def test_honey_pot(self):
@@ -82,4 +98,18 @@ class ContactFormSerializerTestCase(BaseTest):
         security_hash = create_timestamp_hash(t)
         serializer.validate(dict(security_hash=security_hash, timestamp=t))
         with self.assertRaises(serializers.ValidationError):
-            serializer.validate(dict(security_hash=security_hash, timestamp=t+1))
\ No newline at end of file
+            serializer.validate(dict(security_hash=security_hash, timestamp=t+1))
+
+    def test_security_hash_depends_on_secret_key(self):
+        t = time.time()
+        security_hash = create_timestamp_hash(t)
+        self.assertTrue(verify_timestamp_hash(t, security_hash))
+        with self.settings(SECRET_KEY='another secret'):
+            self.assertFalse(verify_timestamp_hash(t, security_hash))
+
+    def test_non_ascii_security_hash_is_invalid(self):
+        t = str(time.time() - 10)
+        serializer = ContactFormSerializer(data=dict(name='Bob', email='a@b.com', message='Hi', contact_number='',
+                                                     security_hash='é' + create_timestamp_hash(t)[1:], timestamp=t))
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('non_field_errors', serializer.errors)
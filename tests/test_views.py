@@ -1,7 +1,7 @@
 import logging
 
 from citation.models import (
-    Container, Publication, PublicationPlatforms, Platform, Author, PublicationAuthors)
+    Container, Publication, PublicationPlatforms, Platform, Author, PublicationAuthors, Note)
 from django.urls import reverse
 
 from .common import BaseTest
@@ -25,3 +25,35 @@ class PublicationDetailTest(BaseTest):
     def test_reverse(self):
         url = reverse('citation:publication_detail', args=[self.publication.pk])
         logger.debug("url: %s", url)
+
+    def test_detail_json_is_encoded_once(self):
+        self.login(username='bobsmith', password='test')
+        response = self.client.get(self.publication.get_absolute_url(), HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['id'], self.publication.id)
+        self.assertEqual(data['title'], 'Foo')
+
+
+class PublicationListTest(BaseTest):
+    def test_list_json_is_encoded_once(self):
+        self.login()
+        response = self.client.get(reverse('citation:publications'), HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertIsInstance(data['results'], list)
+        self.assertIsInstance(data['count'], int)
+
+
+class NoteListTest(BaseTest):
+    def test_notes_are_paginated(self):
+        publication = Publication.objects.create(title='Foo', added_by=self.user)
+        for text in ('first', 'second'):
+            Note.objects.create(text=text, publication=publication, added_by=self.user)
+        self.login()
+        response = self.client.get(reverse('citation:notes'), HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['count'], 2)
+        self.assertEqual([note['text'] for note in data['results']], ['first', 'second'])
+        self.assertEqual(data['results'][0]['added_by'], self.user.username)
@@ -1,9 +1,23 @@
 import ast
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import patch
 
 from citation import models, util
 from citation.bibtex import ref as bibtex_ref_api, entry as bibtex_entry_api
+from citation.graphviz.globals import CacheNames
+from citation.ping_urls import HostThrottle, check_code_archive_urls
+from citation.renderers import ORJSONRenderer
+from citation.serializers import get_model_documentation_json
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.test import TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
 
 
 class TestAuthorParsing(TestCase):
@@ -110,3 +124,148 @@ class TestNameNormalization(TestCase):
 
         last_name_and_initial_str = util.last_name_and_initial(" ".join(last_name_and_initials_str))
         self.assertEqual(last_name_and_initial_str, "ABBAS A")
+
+
+class TestPublicationTitleHash(TestCase):
+    def test_hash_ignores_case_and_whitespace(self):
+        self.assertEqual(models.hash_title('Agent Based  Models\n'), models.hash_title('agent based models'))
+        self.assertNotEqual(models.hash_title('Agent Based Models'), models.hash_title('Agent Based Model'))
+
+    def test_duplicates_by_container_and_title(self):
+        user = User.objects.create_user(username='bar', email='a@b.com', password='test')
+        container = models.Container.objects.create(name='JASSS')
+        publication = models.Publication.objects.create(title='Agent Based Models', container=container,
+                                                        added_by=user)
+        detached = models.Publication(title='AGENT BASED  MODELS')
+        self.assertEqual(list(detached.duplicates(container=container)), [publication])
+
+
+class TestContainerDuplicates(TestCase):
+    def test_empty_issn_only_matches_by_name(self):
+        jasss = models.Container.objects.create(name='JASSS', issn='')
+        models.Container.objects.create(name='Ecological Modelling', issn='')
+        self.assertEqual(list(models.Container(name='JASSS', issn='').duplicates()), [jasss])
+        self.assertEqual(list(models.Container(name='Simulation', issn='').duplicates()), [])
+
+    def test_issn_matches_issn_and_eissn(self):
+        jasss = models.Container.objects.create(name='JASSS', issn='1460-7425')
+        online = models.Container.objects.create(name='JASSS Online', eissn='1460-7425')
+        self.assertEqual(set(models.Container(name='', issn='1460-7425').duplicates()), {jasss, online})
+
+
+class TestPublicationYearPublished(TestCase):
+    def test_parse_year_published(self):
+        self.assertEqual(models.parse_year_published('March 2013'), 2013)
+        self.assertEqual(models.parse_year_published('2013-03-04'), 2013)
+        self.assertIsNone(models.parse_year_published('n.d.'))
+
+    def test_unsaved_publication_parses_year_published(self):
+        publication = models.Publication(title='Agent Based Models', date_published_text='March 2013')
+        self.assertEqual(publication.get_year_published(), 2013)
+        self.assertIn('2013', str(publication))
+
+
+class TestCodeArchiveUrlMatcher(TestCase):
+    @staticmethod
+    def make_pattern(host, path, category):
+        pattern = models.CodeArchiveUrlPattern(regex_host_matcher=host, regex_path_matcher=path)
+        pattern.host_matcher = re.compile(host) if host else models.Match.always()
+        pattern.path_matcher = re.compile(path) if path else models.Match.always()
+        pattern.category_name = category
+        return pattern
+
+    def setUp(self):
+        self.patterns = [
+            self.make_pattern(r'ccl\.northwestern\.edu', r'/netlogo/models/community', 'NetLogo'),
+            self.make_pattern(r'(www\.)?github\.com', '', 'GitHub'),
+            self.make_pattern(r'.*northwestern\.edu', '', 'University'),
+            self.make_pattern('', r'.*\.zip$', 'Archive'),
+        ]
+        self.matcher = models.CodeArchiveUrlMatcher(self.patterns)
+
+    def category(self, host, path):
+        pattern = self.matcher.match(host, path)
+        return pattern.category_name if pattern is not None else None
+
+    def test_highest_priority_pattern_wins(self):
+        self.assertEqual(self.category('ccl.northwestern.edu', '/netlogo/models/community/Foo'), 'NetLogo')
+        self.assertEqual(self.category('github.com', '/comses/citation'), 'GitHub')
+
+    def test_falls_back_when_path_does_not_match(self):
+        self.assertEqual(self.category('ccl.northwestern.edu', '/people'), 'University')
+        self.assertEqual(self.category('example.com', '/model.zip'), 'Archive')
+        self.assertIsNone(self.category('example.com', '/model'))
+        self.assertIsNone(self.category(None, None))
+
+    def test_no_patterns_match_nothing(self):
+        self.assertIsNone(models.CodeArchiveUrlMatcher([]).match('github.com', '/comses/citation'))
+
+    def test_cached_matcher_is_rebuilt_when_patterns_change(self):
+        matcher = models.get_code_archive_url_matcher()
+        self.assertIs(matcher, models.get_code_archive_url_matcher())
+        category = models.CodeArchiveUrlCategory.objects.create(category='Archive', subcategory='Example')
+        models.CodeArchiveUrlPattern.objects.create(regex_host_matcher=r'models\.example\.org$',
+                                                    regex_path_matcher='', category=category)
+        rebuilt_matcher = models.get_code_archive_url_matcher()
+        self.assertIsNot(matcher, rebuilt_matcher)
+        self.assertEqual(rebuilt_matcher.match('models.example.org', '/abm').category, category)
+
+    def test_invalid_pattern_regex_is_rejected(self):
+        category = models.CodeArchiveUrlCategory(category='Archive', subcategory='Example')
+        pattern = models.CodeArchiveUrlPattern(regex_host_matcher=r'(github\.com', regex_path_matcher='',
+                                               category=category)
+        with self.assertRaises(ValidationError):
+            pattern.clean()
+
+
+class TestURLStatusLogHeaders(TestCase):
+    def test_only_recorded_headers_are_kept(self):
+        headers = {'Content-Type': 'text/html', 'ETag': '"abc"', 'Set-Cookie': 'session=1',
+                   'Content-Security-Policy': "default-src 'self'"}
+        self.assertEqual(json.loads(models.URLStatusLog.serialize_headers(headers)),
+                         {'Content-Type': 'text/html', 'ETag': '"abc"'})
+
+
+class TestCheckCodeArchiveUrls(TestCase):
+    def test_urls_on_unreachable_host_are_skipped(self):
+        user = User.objects.create_user(username='bar', email='a@b.com', password='test')
+        publication = models.Publication.objects.create(title='Agent Based Models', added_by=user)
+        unknown = models.CodeArchiveUrlCategory.objects.get(category='Unknown')
+        timed_out, skipped = [
+            models.CodeArchiveUrl.objects.create(publication=publication, url=url, category=unknown, creator=user,
+                                                 status=models.CodeArchiveUrl.STATUS.available)
+            for url in ('https://models.example.org/a', 'https://models.example.org/b')]
+        with patch.object(models.CodeArchiveUrl, 'ping', return_value=None) as ping, \
+                ThreadPoolExecutor(max_workers=1) as executor:
+            check_code_archive_urls([timed_out, skipped], executor, session=None,
+                                    matcher=models.CodeArchiveUrlMatcher([]), fallback_category=unknown,
+                                    throttle=HostThrottle())
+        self.assertEqual(ping.call_count, 1)
+        timed_out.refresh_from_db()
+        skipped.refresh_from_db()
+        self.assertEqual(timed_out.status, models.CodeArchiveUrl.STATUS.unavailable)
+        self.assertEqual(skipped.status, models.CodeArchiveUrl.STATUS.available)
+        self.assertEqual(list(models.URLStatusLog.objects.values_list('url', flat=True)), [timed_out.url])
+
+
+class TestORJSONRenderer(TestCase):
+    def test_render_matches_drf_encoding(self):
+        data = {'title': gettext_lazy('Publication'), 'volume': Decimal('1.5'), 'notes': None, 1: 'one',
+                'date_added': datetime(2020, 3, 4, 5, 6, 7, 891234, tzinfo=timezone.utc)}
+        self.assertEqual(json.loads(ORJSONRenderer().render(data)),
+                         json.loads(JSONRenderer().render(data)))
+        self.assertEqual(json.loads(ORJSONRenderer().render(data))['date_added'], '2020-03-04T05:06:07.891Z')
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_indented_render_falls_back_to_json_renderer(self):
+        data = {'title': 'Publication', 'volume': Decimal('1.5')}
+        self.assertEqual(ORJSONRenderer().render(data, 'application/json; indent=4'),
+                         JSONRenderer().render(data, 'application/json; indent=4'))
+
+
+class TestModelDocumentationJson(TestCase):
+    def test_cached_list_is_cleared_on_save(self):
+        cache.delete(CacheNames.MODEL_DOCUMENTATION_LIST.value)
+        self.assertNotIn('UML', [md['name'] for md in json.loads(get_model_documentation_json())])
+        models.ModelDocumentation.objects.create(name='UML')
+        self.assertIn('UML', [md['name'] for md in json.loads(get_model_documentation_json())])